@@ -1,14 +1,2264 @@
 #!/usr/bin/env python3
 """Patent Scraper - Find patent opportunities and expired patents"""
+import asyncio
+import bisect
+import contextlib
+import concurrent.futures
+import csv
+import dataclasses
+import hashlib
+import heapq
+import os
 import requests
+import aiohttp
 import json
-from datetime import datetime, timedelta
+import numpy as np
+import scipy.sparse
+import math
+import mmap
+import random
+import re
+import sqlite3
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+import zlib
+from array import array
+from datetime import datetime, timedelta, timezone
+from collections import Counter, OrderedDict
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import parse_header_links
+from urllib3.util.request import ACCEPT_ENCODING
+
+DEFAULT_CONFIG = {
+    'api_url': 'https://api.github.com',
+    'state_dir': '.patent-scraper',
+    
+    # HTTP connection pool (limits are per host)
+    'pool_connections': 4,
+    'pool_maxsize': 16,
+    'pool_block': True,
+    'keep_alive': True,
+    'request_timeout': 30,
+    
+    # Async query fan-out and search pagination
+    'max_concurrency': 8,
+    'per_page': 100,
+    'max_repos_per_query': None,
+    
+    # Split queries over the 1000-result cap into created: date windows
+    'shard_queries': True,
+    'shard_min_date': '2008-01-01',
+    
+    # Rate limiting (GitHub: 30 searches/min, 5000 core calls/hour)
+    'search_rate_per_minute': 30,
+    'search_burst': 10,
+    'core_rate_per_hour': 5000,
+    'core_burst': 100,
+    'graphql_rate_per_hour': 5000,
+    'graphql_burst': 20,
+    'max_retries': 5,
+    'backoff_base': 1.0,
+    'backoff_cap': 60.0,
+    
+    # Conditional-request response cache (304s are free against the quota)
+    'response_cache': True,
+    'cache_max_bytes': 256 * 1024 * 1024,
+    
+    # GraphQL metadata enrichment
+    'graphql_batch_size': 50,
+    'graphql_max_cost': 2,
+    'activity_window_days': 90,
+    
+    # Incremental runs: only fetch repos pushed since the last checkpoint
+    'incremental': True,
+    'checkpoint_file': 'checkpoint.json',
+    'seen_file': 'seen-repos.bin',
+    
+    # Persistent innovation-score memo keyed on (repo id, updated_at, rules version)
+    'score_memo': True,
+    'score_memo_file': 'score-memo.json',
+    'score_memo_max_entries': 200000,
+    
+    # Process-pool scoring stage (smaller batches are scored in-process)
+    'scoring_workers': None,
+    'scoring_batch_size': 1000,
+    'scoring_chunk_size': 250,
+    'scoring_min_pool_batch': 500,
+    
+    # Keep only the best innovations (None = unbounded), ties broken by stars
+    'min_innovation_score': 70,
+    'top_k_per_query': 100,
+    'top_k': 200,
+    
+    # Local USPTO bulk grant corpus (ipg*.xml / PatentsView *.tsv, optionally zipped)
+    'patent_bulk_dir': 'patent-bulk',
+    'patent_store': 'patents.sqlite',
+    'ingest_batch_size': 5000,
+    'expired_window_days': 365,
+    'max_expired_patents': 100,
+    'expiry_index': 'expiry-index',
+    'patent_search_limit': 20,
+    
+    # BM25 prior-art matching of innovation repos against patent abstracts and claims
+    'prior_art_index': 'prior-art-index',
+    'prior_art_top_k': 5,
+    
+    # TF-IDF gap engine: a technology is a gap when few patents reach the similarity threshold
+    'gap_index': 'gap-index',
+    'gap_similarity_threshold': 0.2,
+    'gap_max_coverage': 25,
+    
+    # MinHash/LSH shortlist: BM25 prior-art scoring only runs on the candidates it returns
+    'near_duplicate_index': 'near-duplicate-index',
+    'minhash_permutations': 128,
+    'minhash_bands': 64,
+    'prior_art_shortlist': 500,
+    # Postings read from each repo's rarest terms to top the LSH shortlist up
+    'prior_art_topup_postings': 50000,
+    
+    # Citation-graph valuation of expired patents: PageRank over forward citations, cached per graph
+    'citation_rank': 'citation-rank',
+    'pagerank_damping': 0.85,
+    'pagerank_tolerance': 1e-10,
+    'pagerank_max_iterations': 100,
+    
+    # Patent families: grants sharing an application or priority claim are reported once
+    'patent_families': 'patent-families',
+    
+    # CPC classification index: trending technologies and the CPC subtrees that cover them
+    'cpc_index': 'cpc-index',
+    'technology_cpc': {
+        'AI agent orchestration': ['G06N', 'G06F9/48', 'G06F9/50'],
+        'Serverless automation frameworks': ['G06F9/445', 'G06F9/455', 'H04L67/10'],
+        'Cross-platform development tools': ['G06F8', 'G06F9/451'],
+        'Blockchain automation systems': ['H04L9/50', 'G06Q20/38', 'G06F16/27'],
+        'Voice-controlled programming interfaces': ['G10L15/22', 'G06F3/167', 'G06F8/34'],
+    },
+    # Restrict expired patents to these CPC subtrees (empty: every area)
+    'expired_patent_cpc': [],
+}
+
+# GitHub search never returns more than this many results per query
+SEARCH_RESULT_CAP = 1000
+# One aliased block per repo; each block opens this many connections
+REPO_METADATA_FIELDS = """
+    nameWithOwner
+    stargazerCount
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    releases { totalCount }
+    readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+    defaultBranchRef { target { ... on Commit { history(since: %s) { totalCount } } } }
+"""
+REPO_METADATA_CONNECTIONS = 3
+# Bump whenever assess_innovation_potential's rules change so memoized scores are dropped
+SCORING_RULES_VERSION = 2
+# Repos younger than this get the recent-creation bonus
+RECENT_REPO_DAYS = 90
+# Description keywords and the points each one found adds to the innovation score
+INNOVATION_KEYWORDS = ['novel', 'new', 'innovative', 'breakthrough', 'unique', 'original']
+TECH_KEYWORDS = ['ai', 'machine learning', 'blockchain', 'automation', 'algorithm']
+INNOVATION_KEYWORD_POINTS = 10
+TECH_KEYWORD_POINTS = 8
+# Columns kept for every ingested grant
+PATENT_FIELDS = (
+    'patent_id', 'kind', 'title', 'abstract', 'claims', 'grant_date', 'filing_date', 'application_id',
+    # Term inputs: adjustment/extension days, terminal disclaimer flag and date, length of grant in years
+    'term_extension', 'terminal_disclaimer', 'disclaimer_date', 'term_years')
+# Columns searchable through the full-text index
+PATENT_TEXT_FIELDS = ('title', 'abstract', 'claims')
+# Words too common in patents and READMEs to say anything about prior art
+STOPWORDS = frozenset('''
+    a an and are as at be by for from has have in is it its of on or that the this to was were will with
+    which wherein said claim claims comprising method system apparatus device one more first second
+'''.split())
+# Hashed term space: no vocabulary to store, and ids are stable across processes and runs
+TERM_FEATURES = 2 ** 20
+# Only the start of a README goes into its prior-art query
+PRIOR_ART_README_CHARS = 5000
+# Delta segments of the near-duplicate index are merged once there are more than this many
+MAX_INDEX_SEGMENTS = 8
+# Bulk TSV header -> store column (PatentsView and plain exports)
+TSV_COLUMNS = {
+    'patent_id': 'patent_id', 'patent_number': 'patent_id',
+    'patent_title': 'title', 'title': 'title',
+    'patent_abstract': 'abstract', 'abstract': 'abstract',
+    'patent_date': 'grant_date', 'grant_date': 'grant_date',
+    'filing_date': 'filing_date', 'application_id': 'application_id',
+    'wipo_kind': 'kind', 'kind': 'kind',
+    'term_extension': 'term_extension', 'term_disclaimer': 'terminal_disclaimer',
+    'disclaimer_date': 'disclaimer_date', 'term_grant': 'term_years',
+    # g_us_patent_citation.tsv: one row per (citing patent_id, cited patent) pair
+    'citation_patent_id': 'citations',
+    # g_foreign_priority.tsv and g_us_related_documents.tsv: one row per priority/parent application
+    'foreign_application_id': 'priorities', 'foreign_country_filed': 'priority_country',
+    'related_doc_number': 'priorities', 'published_country': 'priority_country',
+    # g_cpc_current.tsv: one row per CPC group assigned to a patent_id
+    'cpc_group': 'cpc',
+}
+# Term rules: filings before the URAA date get max(17y from grant, 20y from filing);
+# design patents run from grant, 14 years, or 15 when filed on or after the Hague date
+URAA_DATE = '1995-06-08'
+HAGUE_DATE = '2015-05-13'
+# USPTO MaintFeeEvents_*.txt: fixed-width records, field -> (offset, width)
+MAINT_FEE_FILE = re.compile(r'^MaintFeeEvents.*\.txt$')
+MAINT_FEE_FIELDS = {'patent_number': (0, 13), 'event_date': (43, 8), 'event_code': (52, 5)}
+MAINT_FEE_RECORD_MIN = max(offset + width for offset, width in MAINT_FEE_FIELDS.values())
+# Expired for failure to pay, and the events that undo such an expiry
+LAPSE_CODES = {b'EXP.'}
+REINSTATEMENT_CODES = {b'EXPX', b'PMFG'}
+CREATED_QUALIFIER = re.compile(
+    r'\bcreated:(>=|>|<=|<)?(\d{4}-\d{2}-\d{2})(?:\.\.(\d{4}-\d{2}-\d{2}))?')
+QUERY_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+@dataclasses.dataclass(slots=True)
+class Repo:
+    """The handful of GitHub search fields the scorer and packager use (a search item has ~90)"""
+    id: int
+    full_name: str
+    html_url: str
+    description: str
+    created_at: str
+    updated_at: str
+    pushed_at: str
+    stargazers_count: int
+    
+    @classmethod
+    def from_json(cls, item):
+        return cls(
+            id=item['id'],
+            full_name=item['full_name'],
+            html_url=item.get('html_url', ''),
+            # GitHub sends null for repos without a description
+            description=item.get('description') or '',
+            created_at=item['created_at'],
+            updated_at=item.get('updated_at'),
+            pushed_at=item.get('pushed_at'),
+            stargazers_count=item['stargazers_count'])
+
+@dataclasses.dataclass(slots=True)
+class Innovation:
+    repo: Repo
+    innovation_score: int
+    patent_potential: dict
+    commercial_value: str
+    metadata: dict = None
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{**data, 'repo': Repo.from_json(data['repo'])})
+
+@dataclasses.dataclass(slots=True)
+class Patent:
+    patent_id: str
+    title: str
+    expired_date: str
+    original_value: str = None
+    improvement_opportunities: list = dataclasses.field(default_factory=list)
+    market_potential: str = None
+    filing_date: str = None
+    grant_date: str = None
+    expiry_reason: str = None
+    # PageRank relative to the average patent, and citations received, from the citation graph
+    influence: float = None
+    forward_citations: int = None
+    # Every grant in the patent's family (continuations, divisionals, foreign counterparts)
+    family_members: list = dataclasses.field(default_factory=list)
+
+@dataclasses.dataclass(slots=True)
+class PatentGap:
+    technology: str
+    current_patents: int
+    gap_opportunities: list
+    patentability_score: int
+    market_size: str
+    related_patents: list = dataclasses.field(default_factory=list)
+    # Patents at or above the gap similarity threshold, and the closest one's similarity
+    coverage: int = None
+    max_similarity: float = None
+    # Patents of the technology's CPC subtrees that expired within expired_window_days
+    recently_expired: int = None
+
+@dataclasses.dataclass(slots=True)
+class PatentSearchResult:
+    query: str
+    count: int
+    patent_ids: list
+
+class RateLimitScheduler:
+    """Token-bucket scheduler that paces every GitHub call against its rate-limit resource"""
+    def __init__(self, limits, max_retries=5, backoff_base=1.0, backoff_cap=60.0):
+        # resource -> (burst capacity, tokens refilled per second)
+        self.limits = limits
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        now = time.monotonic()
+        self.buckets = {
+            resource: {'tokens': float(capacity), 'updated': now, 'blocked_until': 0.0}
+            for resource, (capacity, _) in limits.items()
+        }
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0}
+    
+    @staticmethod
+    def resource_for(url):
+        """Map a GitHub API URL to its rate-limit resource"""
+        if '/search/' in url:
+            return 'search'
+        if url.endswith('/graphql'):
+            return 'graphql'
+        return 'core'
+    
+    def reserve(self, resource):
+        """Take a token and return how long the caller must wait before sending"""
+        capacity, per_second = self.limits[resource]
+        with self.lock:
+            bucket = self.buckets[resource]
+            now = time.monotonic()
+            bucket['tokens'] = min(capacity, bucket['tokens'] + (now - bucket['updated']) * per_second)
+            bucket['updated'] = now
+            # Tokens may go negative: later callers queue behind the debt
+            bucket['tokens'] -= 1
+            wait = max(-bucket['tokens'] / per_second, bucket['blocked_until'] - now, 0.0)
+            self.stats['requests'] += 1
+            self.stats['throttled_seconds'] += wait
+        return wait
+    
+    def acquire(self, resource):
+        """Block until a request against the resource may be sent"""
+        wait = self.reserve(resource)
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self, resource):
+        """Wait without blocking the event loop until a request may be sent"""
+        wait = self.reserve(resource)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def refund(self, resource):
+        """Return a token for a request GitHub did not charge (e.g. a 304)"""
+        capacity, _ = self.limits[resource]
+        with self.lock:
+            bucket = self.buckets[resource]
+            bucket['tokens'] = min(capacity, bucket['tokens'] + 1)
+    
+    def update(self, resource, headers):
+        """Sync the bucket with GitHub's X-RateLimit-* response headers"""
+        resource = headers.get('X-RateLimit-Resource', resource)
+        if resource not in self.buckets:
+            return
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None:
+            return
+        with self.lock:
+            bucket = self.buckets[resource]
+            # Never believe we have more quota than the server says
+            bucket['tokens'] = min(bucket['tokens'], float(remaining))
+            if int(remaining) == 0 and reset is not None:
+                bucket['blocked_until'] = max(
+                    bucket['blocked_until'], time.monotonic() + max(float(reset) - time.time(), 0.0))
+    
+    @staticmethod
+    def is_throttled(status, headers, text=''):
+        """Check whether a response is a rate-limit rejection rather than a real error"""
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+        return ('Retry-After' in headers or headers.get('X-RateLimit-Remaining') == '0'
+                or 'rate limit' in text.lower())
+    
+    @classmethod
+    def is_retryable(cls, status, headers, text=''):
+        """Check whether a response is worth retrying: a rate-limit rejection or a transient 5xx"""
+        return status >= 500 or cls.is_throttled(status, headers, text)
+    
+    def retry_delay(self, attempt, headers):
+        """Compute the wait before retrying: Retry-After, quota reset, or jittered backoff"""
+        retry_after = headers.get('Retry-After')
+        reset = headers.get('X-RateLimit-Reset')
+        if retry_after is not None:
+            delay = float(retry_after) + random.uniform(0, self.backoff_base)
+        elif headers.get('X-RateLimit-Remaining') == '0' and reset is not None:
+            delay = max(float(reset) - time.time(), 0.0) + random.uniform(0, self.backoff_base)
+        else:
+            # Full jitter exponential backoff
+            delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        with self.lock:
+            self.stats['retries'] += 1
+            self.stats['throttled_seconds'] += delay
+        return delay
+
+class ResponseCache:
+    """Size-bounded on-disk LRU cache of GitHub GET responses, revalidated with ETag/Last-Modified"""
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # hits: served after a 304; stale: a cached entry the server replaced with a new 200
+        self.stats = {'hits': 0, 'stale': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        os.makedirs(directory, exist_ok=True)
+        
+        # File mtime doubles as the LRU clock, so no separate index is persisted
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                info = os.stat(os.path.join(directory, name))
+                entries.append((info.st_mtime, name[:-5], info.st_size))
+        self.entries = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self.total_bytes = sum(self.entries.values())
+    
+    @staticmethod
+    def key_for(url, params=None):
+        """Hash the fully encoded request URL"""
+        prepared = requests.Request('GET', url, params=params).prepare()
+        return hashlib.sha256(prepared.url.encode()).hexdigest()
+    
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def lookup(self, key):
+        """Return the cached entry for a request key, or None"""
+        with self.lock:
+            if key not in self.entries:
+                self.stats['misses'] += 1
+                return None
+        try:
+            with open(self.path_for(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.discard(key)
+            self.stats['misses'] += 1
+            return None
+        # Only a 304 makes this a hit; see revalidated() and store()
+        return entry
+    
+    @staticmethod
+    def conditional_headers(entry):
+        """Build If-None-Match/If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def revalidated(self, key, entry):
+        """Serve a cached entry after a 304 and mark it most recently used"""
+        with self.lock:
+            self.stats['hits'] += 1
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        with contextlib.suppress(OSError):
+            os.utime(self.path_for(key))
+        return entry['body'], CaseInsensitiveDict(entry['headers'])
+    
+    def store(self, key, body, headers, stale=False):
+        """Persist a 200 response that carries a validator; stale means it replaces a cached entry"""
+        if stale:
+            with self.lock:
+                self.stats['stale'] += 1
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': {name: headers[name] for name in ('Link',) if name in headers},
+            'body': body
+        }
+        payload = json.dumps(entry).encode()
+        tmp_path = f"{self.path_for(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path_for(key))
+        
+        with self.lock:
+            self.total_bytes += len(payload) - self.entries.pop(key, 0)
+            self.entries[key] = len(payload)
+            self.stats['stores'] += 1
+            # Evict least recently used entries until back under budget
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_key, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                self.stats['evictions'] += 1
+                with contextlib.suppress(OSError):
+                    os.remove(self.path_for(old_key))
+    
+    def discard(self, key):
+        with self.lock:
+            self.total_bytes -= self.entries.pop(key, 0)
+        with contextlib.suppress(OSError):
+            os.remove(self.path_for(key))
+
+class RepoIdSet:
+    """Compact set of integer repo ids: a sorted int64 array plus a small insert buffer"""
+    def __init__(self, ids=(), merge_threshold=4096):
+        self.ids = array('q', sorted(set(ids)))
+        self.pending = set()
+        self.merge_threshold = merge_threshold
+        self.duplicates = 0
+    
+    def __contains__(self, repo_id):
+        if repo_id in self.pending:
+            return True
+        index = bisect.bisect_left(self.ids, repo_id)
+        return index < len(self.ids) and self.ids[index] == repo_id
+    
+    def __len__(self):
+        return len(self.ids) + len(self.pending)
+    
+    def add(self, repo_id):
+        """Add an id, returning False if it was already seen"""
+        if repo_id in self:
+            self.duplicates += 1
+            return False
+        self.pending.add(repo_id)
+        if len(self.pending) >= self.merge_threshold:
+            self.compact()
+        return True
+    
+    def compact(self):
+        """Merge the insert buffer into the sorted array (8 bytes per id)"""
+        if self.pending:
+            self.ids = array('q', heapq.merge(self.ids, sorted(self.pending)))
+            self.pending.clear()
+    
+    def save(self, path):
+        self.compact()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            self.ids.tofile(f)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path):
+        seen = cls()
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                seen.ids.frombytes(f.read())
+        return seen
+
+class TopK:
+    """Bounded min-heap keeping the k best items by (score, stars); earlier items win full ties"""
+    def __init__(self, k=None):
+        self.k = k
+        self.heap = []
+        self.pushed = 0
+    
+    def __len__(self):
+        return len(self.heap)
+    
+    def push(self, item, score, stars):
+        # The sequence number keeps tuples from ever comparing the items themselves
+        entry = (score, stars, -self.pushed, item)
+        self.pushed += 1
+        if self.k is None or len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry[:3] > self.heap[0][:3]:
+            heapq.heapreplace(self.heap, entry)
+    
+    def items(self):
+        """Return the kept items, best first"""
+        return [entry[3] for entry in sorted(self.heap, reverse=True)]
+
+class RunCheckpoint:
+    """Persisted per-query high-water marks, seen repo versions and the previous innovations"""
+    def __init__(self, path, seen_path):
+        self.path = path
+        self.seen_path = seen_path
+        # query -> {'created_at': max seen, 'pushed_at': max seen}
+        self.high_water = {}
+        # Fingerprints of the repo versions the last run saw, and those this run has seen so far;
+        # only repos fetched again are kept, so the set tracks the delta rather than growing forever
+        self.previous = RepoIdSet.load(seen_path)
+        self.seen = RepoIdSet()
+        self.innovations = []
+        self.stats = {'scored': 0, 'unchanged': 0, 'carried_over': 0}
+        if os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.high_water = state.get('high_water', {})
+            self.innovations = [Innovation.from_dict(i) for i in state.get('innovations', [])]
+    
+    def delta_query(self, query):
+        """Narrow a query to repos pushed at or after its high-water mark"""
+        mark = self.high_water.get(query, {}).get('pushed_at')
+        # Whole days keep the query text stable across runs, so its pages can revalidate from the cache;
+        # inclusive, and repos pushed earlier on the mark's day come back only to be skipped as unchanged
+        return f"{query} pushed:>={mark[:10]}" if mark else query
+    
+    def observe(self, query, repo):
+        """Advance the query's created_at/pushed_at high-water marks (ISO strings sort by time)"""
+        mark = self.high_water.setdefault(query, {})
+        for field in ('created_at', 'pushed_at'):
+            value = getattr(repo, field)
+            if value and value > mark.get(field, ''):
+                mark[field] = value
+    
+    @staticmethod
+    def fingerprint(repo):
+        """Signed 64-bit hash of a repo id and the timestamps that move when the repo changes"""
+        digest = hashlib.blake2b(f"{repo.id}:{repo.pushed_at}:{repo.updated_at}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
+    
+    def unchanged(self, repo):
+        """Check whether a repo was already scored and has not been pushed or updated since"""
+        fingerprint = self.fingerprint(repo)
+        if fingerprint in self.previous:
+            self.seen.add(fingerprint)
+            self.stats['unchanged'] += 1
+            return True
+        return False
+    
+    def record(self, repo):
+        self.seen.add(self.fingerprint(repo))
+        self.stats['scored'] += 1
+    
+    def carried_over(self, rescored_ids):
+        """Previous innovations for repos this run did not rescore"""
+        return [i for i in self.innovations if i.repo.id not in rescored_ids]
+    
+    def merge(self, carried, scores, innovations, min_score):
+        """Apply current scores to carried-over innovations, dropping lapsed ones, and add this run's results"""
+        kept = []
+        for innovation, innovation_score in zip(carried, scores):
+            if innovation_score > min_score:
+                innovation.innovation_score = innovation_score
+                innovation.commercial_value = f"${innovation_score * 10000}+"
+                kept.append(innovation)
+        self.stats['carried_over'] = len(kept)
+        self.innovations = kept + innovations
+        return self.innovations
+    
+    def save(self):
+        state = {
+            'high_water': self.high_water,
+            'innovations': [dataclasses.asdict(i) for i in self.innovations]
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.seen.save(self.seen_path)
+        save_json(self.path, state)
+
+class ScoreMemo:
+    """Persistent LRU memo of innovation scores keyed on repo id, updated_at and rules version"""
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # key -> [score, epoch seconds after which the score is stale or None]
+        self.entries = OrderedDict()
+        if os.path.exists(path):
+            with contextlib.suppress(OSError, ValueError):
+                with open(path) as f:
+                    self.entries = OrderedDict(json.load(f))
+    
+    @staticmethod
+    def key_for(repo):
+        return f"{repo.id}:{repo.updated_at}:{SCORING_RULES_VERSION}"
+    
+    def lookup(self, repo):
+        """Return the memoized score for an unchanged repo, or None"""
+        key = self.key_for(repo)
+        entry = self.entries.get(key)
+        # The recent-creation bonus lapses with age even if the repo never changes
+        if entry is None or (entry[1] is not None and time.time() >= entry[1]):
+            self.stats['misses'] += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[0]
+    
+    def store(self, repo, score):
+        created = datetime.fromisoformat(repo.created_at.replace('Z', '+00:00'))
+        recent_until = (created + timedelta(days=RECENT_REPO_DAYS)).timestamp()
+        key = self.key_for(repo)
+        self.entries[key] = [score, recent_until if recent_until > time.time() else None]
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+    
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+    
+    def save(self):
+        save_json(self.path, list(self.entries.items()))
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds whole-word keyword matches in one pass over the text"""
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        # Trie as parallel arrays: transitions, failure link and keyword indices ending at each state
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword.lower():
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(index)
+        
+        # Breadth-first failure links; each state inherits the outputs of its failure state
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0) if state else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+    
+    @staticmethod
+    def is_word_char(char):
+        return char.isalnum() or char == '_'
+    
+    def find(self, text):
+        """Return the indices of keywords occurring in lowercased text as whole words"""
+        found = set()
+        state = 0
+        length = len(text)
+        for end, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            if not self.output[state]:
+                continue
+            # 'ai' must not match inside 'maintain', nor 'new' inside 'renewal'
+            if end + 1 < length and self.is_word_char(text[end + 1]):
+                continue
+            for index in self.output[state]:
+                start = end + 1 - len(self.keywords[index])
+                if start == 0 or not self.is_word_char(text[start - 1]):
+                    found.add(index)
+        return found
+
+def hashed_terms(text):
+    """Hash the non-stopword terms of a text into the TERM_FEATURES space"""
+    return [zlib.crc32(term.encode()) % TERM_FEATURES
+            for term in re.findall(r'[a-z0-9]{2,}', (text or '').lower()) if term not in STOPWORDS]
+
+def term_count_matrix(store, columns):
+    """Stream the corpus into a patent x hashed-term CSR matrix of raw term counts"""
+    patent_ids = []
+    indptr, indices, counts = array('q', [0]), array('i'), array('f')
+    for rows in store.iter_text_rows(columns):
+        for patent_id, *texts in rows:
+            terms = Counter(term for text in texts for term in hashed_terms(text))
+            patent_ids.append(patent_id)
+            indices.extend(terms.keys())
+            counts.extend(terms.values())
+            indptr.append(len(indices))
+    docs = scipy.sparse.csr_matrix(
+        (np.frombuffer(counts, dtype=np.float32), np.frombuffer(indices, dtype=np.int32),
+         np.frombuffer(indptr, dtype=np.int64)),
+        shape=(len(patent_ids), TERM_FEATURES))
+    return docs, patent_ids
+
+def column_path(directory, name):
+    return os.path.join(directory, f"{name}.npy")
+
+def save_columns(directory, columns):
+    """Write named .npy columns in order, each to a temp file renamed into place; the last marks a complete set"""
+    os.makedirs(directory, exist_ok=True)
+    for name, column in columns.items():
+        path = column_path(directory, name)
+        np.save(f"{path}.tmp.npy", column)
+        os.replace(f"{path}.tmp.npy", path)
+
+def load_columns(directory, names):
+    """Memory-map named .npy columns, so a query only touches the pages it reads"""
+    return tuple(np.load(column_path(directory, name), mmap_mode='r') for name in names)
+
+def save_json(path, value):
+    """Write JSON to a temp file renamed into place, so readers never see a partial file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(value, f)
+    os.replace(f"{path}.tmp", path)
+
+class PriorArtIndex:
+    """BM25 inverted index of patent abstracts and claims: a term x patent CSR matrix of BM25 weights"""
+    def __init__(self, directory, k1=1.2, b=0.75, batch_size=32, topup_postings=50000):
+        self.directory = directory
+        self.topup_postings = topup_postings
+        self.k1 = k1
+        self.b = b
+        self.batch_size = batch_size
+        self.postings = None
+        self.idf = None
+        self.patent_ids = None
+        self.id_order = None
+        self.sorted_ids = None
+    
+    def __getstate__(self):
+        # Workers map the files themselves instead of receiving pickled copies
+        return {**self.__dict__, 'postings': None, 'idf': None, 'patent_ids': None, 'id_order': None,
+                'sorted_ids': None}
+    
+    def exists(self):
+        return all(os.path.exists(column_path(self.directory, name)) for name in ('sorted_ids', 'patent_ids'))
+    
+    def build(self, store):
+        """Tokenize the corpus in chunks and write BM25-weighted posting lists"""
+        docs, patent_ids = term_count_matrix(store, ('abstract', 'claims'))
+        lengths = np.asarray(docs.sum(axis=1)).ravel()
+        document_frequency = np.bincount(docs.indices, minlength=TERM_FEATURES)
+        idf = np.log1p((len(patent_ids) - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        
+        # BM25 term weight per (patent, term), with length normalisation folded in
+        average = lengths.mean() if len(lengths) else 1.0
+        norm = np.repeat(self.k1 * (1 - self.b + self.b * lengths / max(average, 1.0)), np.diff(docs.indptr))
+        tf = docs.data
+        docs.data = (idf[docs.indices] * tf * (self.k1 + 1) / (tf + norm)).astype(np.float32)
+        # Term-major rows are the posting lists a query walks, sorted so candidates can be binary searched
+        postings = docs.T.tocsr()
+        postings.sort_indices()
+        patent_ids = np.array(patent_ids, dtype='S16')
+        id_order = np.argsort(patent_ids, kind='stable')
+        # The id-sorted copy lets positions() binary-search ids without gathering the column per query
+        save_columns(self.directory, {
+            'data': postings.data, 'indices': postings.indices, 'indptr': postings.indptr, 'idf': idf,
+            'id_order': id_order, 'sorted_ids': patent_ids[id_order], 'patent_ids': patent_ids
+        })
+        self.reset()
+    
+    def reset(self):
+        self.postings = self.idf = self.patent_ids = self.id_order = self.sorted_ids = None
+    
+    def load(self):
+        if self.postings is None:
+            data, indices, indptr, self.idf, self.id_order, self.sorted_ids, self.patent_ids = load_columns(
+                self.directory, ('data', 'indices', 'indptr', 'idf', 'id_order', 'sorted_ids', 'patent_ids'))
+            self.postings = scipy.sparse.csr_matrix(
+                (data, indices, indptr), shape=(TERM_FEATURES, len(self.patent_ids)), copy=False)
+    
+    def positions(self, patent_ids):
+        """Map patent ids to their column in the index, dropping ids it does not hold"""
+        patent_ids = np.asarray(patent_ids, dtype='S16')
+        if not len(self.sorted_ids):
+            return np.empty(0, dtype=np.int64)
+        at = np.minimum(np.searchsorted(self.sorted_ids, patent_ids), len(self.sorted_ids) - 1)
+        found = self.sorted_ids[at] == patent_ids
+        return np.unique(self.id_order[at[found]])
+    
+    def shortlist_scores(self, query, candidates):
+        """BM25 scores of the candidate columns only, by binary search in each query term's posting list"""
+        indptr, indices, data = self.postings.indptr, self.postings.indices, self.postings.data
+        scores = np.zeros(len(candidates), dtype=np.float32)
+        for term in query:
+            start, end = indptr[term], indptr[term + 1]
+            if start == end:
+                continue
+            at = np.minimum(np.searchsorted(indices[start:end], candidates), end - start - 1)
+            found = indices[start:end][at] == candidates
+            scores[found] += data[start:end][at[found]]
+        return scores
+    
+    def rare_term_candidates(self, query):
+        """Patents in the posting lists of the query's rarest terms, reading at most topup_postings entries"""
+        indptr, indices = self.postings.indptr, self.postings.indices
+        terms = np.asarray(query, dtype=np.int64)
+        lengths = indptr[terms + 1] - indptr[terms]
+        terms, lengths = terms[lengths > 0], lengths[lengths > 0]
+        order = np.argsort(lengths, kind='stable')
+        # The rarest term is always read, however long its list
+        within = np.cumsum(lengths[order]) <= self.topup_postings
+        within[:1] = True
+        lists = [indices[indptr[term]:indptr[term + 1]] for term in terms[order][within]]
+        return np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.int32)
+    
+    def ranked(self, query, hits, values, k):
+        """Top k (patent_id, score) pairs of one query and its best score relative to the BM25 ceiling"""
+        # A patent can score at most idf * (k1 + 1) per query term
+        ceiling = float(self.idf[query].sum()) * (self.k1 + 1) if query else 0.0
+        keep = values > 0
+        hits, values = hits[keep], values[keep]
+        best = np.argsort(-values)[:k] if len(values) <= k else np.argpartition(-values, k)[:k]
+        best = best[np.argsort(-values[best])]
+        return {
+            'matches': [(self.patent_ids[hits[i]].decode(), round(float(values[i]), 3)) for i in best],
+            'similarity': float(values[best[0]]) / ceiling if len(best) and ceiling else 0.0
+        }
+    
+    def top_matches(self, texts, k=5, candidates=None):
+        """Return, per text, its k closest patents and how close the best one is (0-1)"""
+        self.load()
+        # Candidate ids (an LSH shortlist) are extra candidates: the posting lists of each text's rarest terms
+        # top them up, and a text still left with fewer than k candidates gets full scoring
+        if candidates is not None:
+            results, fallback = [None] * len(texts), []
+            for index, (text, shortlist) in enumerate(zip(texts, candidates)):
+                query = sorted(set(hashed_terms(text)))
+                shortlist = np.union1d(self.positions(shortlist), self.rare_term_candidates(query))
+                if len(shortlist) < k:
+                    fallback.append(index)
+                    continue
+                results[index] = self.ranked(query, shortlist, self.shortlist_scores(query, shortlist), k)
+            for index, result in zip(fallback, self.top_matches([texts[index] for index in fallback], k)):
+                results[index] = result
+            return results
+        
+        results = []
+        for start in range(0, len(texts), self.batch_size):
+            queries = [sorted(set(hashed_terms(text))) for text in texts[start:start + self.batch_size]]
+            matrix = scipy.sparse.csr_matrix(
+                (np.ones(sum(map(len, queries)), dtype=np.float32),
+                 np.fromiter((term for query in queries for term in query), dtype=np.int32),
+                 np.cumsum([0] + [len(query) for query in queries])),
+                shape=(len(queries), TERM_FEATURES))
+            # One sparse product scores the whole batch against every patent
+            scores = (matrix @ self.postings).tocsr()
+            for row, query in enumerate(queries):
+                hits = scores.indices[scores.indptr[row]:scores.indptr[row + 1]]
+                values = scores.data[scores.indptr[row]:scores.indptr[row + 1]]
+                results.append(self.ranked(query, hits, values, k))
+        return results
+
+class NearDuplicateIndex:
+    """MinHash signatures of patent titles and abstracts, bucketed by LSH band, in append-only segments"""
+    def __init__(self, directory, permutations=128, bands=64, batch_size=256):
+        if permutations % bands:
+            raise ValueError("minhash_permutations must be a multiple of minhash_bands")
+        self.directory = directory
+        self.permutations = permutations
+        self.bands = bands
+        self.batch_size = batch_size
+        # Fixed seed: signatures must be comparable across processes and runs
+        generator = np.random.default_rng(0x5eed)
+        self.a = generator.integers(0, 2 ** 63, permutations, dtype=np.uint64) << np.uint64(1) | np.uint64(1)
+        self.b = generator.integers(0, 2 ** 63, permutations, dtype=np.uint64)
+        self.row_weights = generator.integers(1, 2 ** 63, permutations // bands, dtype=np.uint64) | np.uint64(1)
+        self.band_salts = generator.integers(0, 2 ** 63, bands, dtype=np.uint64)
+        self.segments = None
+    
+    def __getstate__(self):
+        # Workers map the segment files themselves
+        return {**self.__dict__, 'segments': None}
+    
+    def manifest_path(self):
+        return os.path.join(self.directory, 'manifest.json')
+    
+    def exists(self):
+        return os.path.exists(self.manifest_path())
+    
+    def manifest(self):
+        """Index layout and progress; a different hashing layout means starting over"""
+        fresh = {'permutations': self.permutations, 'bands': self.bands,
+                 'last_rowid': 0, 'next_segment': 0, 'segments': []}
+        if not self.exists():
+            return fresh
+        with open(self.manifest_path()) as f:
+            manifest = json.load(f)
+        if (manifest['permutations'], manifest['bands']) != (self.permutations, self.bands):
+            return fresh
+        return manifest
+    
+    def signatures(self, texts):
+        """MinHash signatures of many texts at once, plus a mask of the texts that had any terms"""
+        term_sets = [np.fromiter(set(hashed_terms(text)), dtype=np.uint64) for text in texts]
+        signatures = np.full((len(texts), self.permutations), 2 ** 32 - 1, dtype=np.uint32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = term_sets[start:start + self.batch_size]
+            sizes = np.array([len(terms) for terms in batch])
+            if not sizes.any():
+                continue
+            terms = np.concatenate(batch)
+            # Every permutation of every term in one broadcast (multiply-shift hashing), then the minimum per text;
+            # permutation-major so each reduction runs over contiguous memory
+            hashed = ((self.a[:, None] * terms + self.b[:, None]) >> np.uint64(32)).astype(np.uint32)
+            nonempty = np.flatnonzero(sizes)
+            offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])[nonempty]
+            signatures[start + nonempty] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        return signatures, np.array([len(terms) > 0 for terms in term_sets], dtype=bool)
+    
+    def band_keys(self, signatures):
+        """One bucket key per (text, band); uint64 arithmetic wraps, which is fine for a hash"""
+        rows = signatures.reshape(len(signatures), self.bands, -1).astype(np.uint64)
+        return (rows * self.row_weights).sum(axis=2, dtype=np.uint64) ^ self.band_salts
+    
+    def insert(self, store):
+        """Add patents ingested since the last insert as a new segment; returns how many were added"""
+        manifest = self.manifest()
+        keys, docs, patent_ids, last_rowid = [], [], [], manifest['last_rowid']
+        for rows in store.iter_text_rows(('rowid', 'title', 'abstract'), after_rowid=last_rowid):
+            signatures, has_terms = self.signatures([f"{title or ''} {abstract or ''}" for _, _, title, abstract in rows])
+            band_keys = self.band_keys(signatures[has_terms])
+            keys.append(band_keys.ravel())
+            docs.append(np.repeat(np.arange(len(band_keys), dtype=np.int64) + len(patent_ids), self.bands))
+            patent_ids.extend(row[0] for row, kept in zip(rows, has_terms) if kept)
+            last_rowid = rows[-1][1]
+        if last_rowid == manifest['last_rowid']:
+            if not self.exists():
+                self.write_manifest(manifest)
+            return 0
+        
+        segment = f"segment-{manifest['next_segment']:06d}"
+        keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.uint64)
+        docs = np.concatenate(docs) if docs else np.empty(0, dtype=np.int64)
+        self.write_segment(segment, keys, docs, np.array(patent_ids, dtype='S16'))
+        manifest['segments'].append(segment)
+        manifest['next_segment'] += 1
+        manifest['last_rowid'] = last_rowid
+        if len(manifest['segments']) > MAX_INDEX_SEGMENTS:
+            self.compact(manifest)
+        else:
+            self.write_manifest(manifest)
+        return len(patent_ids)
+    
+    def write_segment(self, segment, keys, docs, patent_ids):
+        # Sorted bucket keys: a lookup is a binary search per band
+        order = np.argsort(keys, kind='stable')
+        save_columns(self.directory, {
+            f"{segment}-keys": keys[order], f"{segment}-docs": docs[order].astype(np.int32),
+            f"{segment}-patent_ids": patent_ids
+        })
+    
+    def write_manifest(self, manifest):
+        # The manifest is written last: segments it does not list are ignored
+        save_json(self.manifest_path(), manifest)
+        self.segments = None
+    
+    def compact(self, manifest):
+        """Merge every delta segment into one"""
+        keys, docs, patent_ids = [], [], []
+        for segment in manifest['segments']:
+            segment_keys, segment_docs, segment_ids = load_columns(
+                self.directory, (f"{segment}-keys", f"{segment}-docs", f"{segment}-patent_ids"))
+            keys.append(segment_keys)
+            docs.append(segment_docs.astype(np.int64) + sum(map(len, patent_ids)))
+            patent_ids.append(segment_ids)
+        merged = f"segment-{manifest['next_segment']:06d}"
+        self.write_segment(merged, np.concatenate(keys), np.concatenate(docs), np.concatenate(patent_ids))
+        old, manifest['segments'] = manifest['segments'], [merged]
+        manifest['next_segment'] += 1
+        self.write_manifest(manifest)
+        for segment in old:
+            for name in ('keys', 'docs', 'patent_ids'):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(column_path(self.directory, f"{segment}-{name}"))
+    
+    def load(self):
+        if self.segments is None:
+            self.segments = [
+                load_columns(self.directory, (f"{segment}-keys", f"{segment}-docs", f"{segment}-patent_ids"))
+                for segment in self.manifest()['segments']]
+    
+    def candidates(self, texts, limit):
+        """Per text, the patent ids sharing the most LSH buckets with it, at most limit of them"""
+        self.load()
+        signatures, has_terms = self.signatures(texts)
+        band_keys = self.band_keys(signatures)
+        shortlists = []
+        for text_keys, has_text_terms in zip(band_keys, has_terms):
+            found, votes = [], []
+            for keys, docs, patent_ids in self.segments if has_text_terms else ():
+                starts = np.searchsorted(keys, text_keys, side='left')
+                ends = np.searchsorted(keys, text_keys, side='right')
+                hits = np.concatenate([docs[start:end] for start, end in zip(starts, ends)] or [np.empty(0, np.int32)])
+                hits, counts = np.unique(hits, return_counts=True)
+                found.append(patent_ids[hits])
+                votes.append(counts)
+            if not found:
+                shortlists.append(np.empty(0, dtype='S16'))
+                continue
+            found, votes = np.concatenate(found), np.concatenate(votes)
+            # Shared bands estimate Jaccard similarity, so the best-voted candidates go first
+            shortlists.append(found[np.argsort(-votes, kind='stable')[:limit]])
+        return shortlists
+
+class GapIndex:
+    """L2-normalised TF-IDF matrix of patent abstracts for measuring how crowded a technology is"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.matrix = None
+        self.idf = None
+    
+    def exists(self):
+        return os.path.exists(column_path(self.directory, 'idf'))
+    
+    def build(self, store):
+        """Vectorize every abstract: sublinear tf, smoothed idf, unit-length rows"""
+        docs, _ = term_count_matrix(store, ('abstract',))
+        document_frequency = np.bincount(docs.indices, minlength=TERM_FEATURES)
+        idf = (np.log((1 + docs.shape[0]) / (1 + document_frequency)) + 1).astype(np.float32)
+        docs.data = np.log1p(docs.data) * idf[docs.indices]
+        norms = np.sqrt(np.asarray(docs.multiply(docs).sum(axis=1)).ravel())
+        docs.data /= np.repeat(np.where(norms > 0, norms, 1), np.diff(docs.indptr)).astype(np.float32)
+        
+        save_columns(self.directory, {'data': docs.data, 'indices': docs.indices, 'indptr': docs.indptr, 'idf': idf})
+        self.matrix = self.idf = None
+    
+    def load(self):
+        if self.matrix is None:
+            data, indices, indptr, self.idf = load_columns(self.directory, ('data', 'indices', 'indptr', 'idf'))
+            self.matrix = scipy.sparse.csr_matrix(
+                (data, indices, indptr), shape=(len(indptr) - 1, TERM_FEATURES), copy=False)
+    
+    def vectorize(self, text):
+        """TF-IDF unit vector of a text in the corpus's term space"""
+        terms = Counter(hashed_terms(text))
+        vector = np.zeros(TERM_FEATURES, dtype=np.float32)
+        for term, count in terms.items():
+            vector[term] = np.log1p(count) * self.idf[term]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def coverage(self, text, threshold):
+        """Count the patents whose cosine similarity to the text reaches the threshold"""
+        self.load()
+        # One sparse matrix-vector product scores the whole corpus
+        similarities = self.matrix @ self.vectorize(text)
+        return int(np.count_nonzero(similarities >= threshold)), float(similarities.max(initial=0.0))
+
+class InnovationScorer:
+    """Picklable repo scorer shared by the main process and scoring pool workers"""
+    def __init__(self, prior_art=None, prior_art_top_k=5, near_duplicates=None, shortlist_size=500):
+        self.prior_art = prior_art
+        self.prior_art_top_k = prior_art_top_k
+        self.near_duplicates = near_duplicates
+        self.shortlist_size = shortlist_size
+        # Built once: every description is scanned in a single pass for all keywords
+        self.keyword_matcher = KeywordMatcher(INNOVATION_KEYWORDS + TECH_KEYWORDS)
+        self.keyword_points = np.array(
+            [INNOVATION_KEYWORD_POINTS] * len(INNOVATION_KEYWORDS) + [TECH_KEYWORD_POINTS] * len(TECH_KEYWORDS),
+            dtype=np.int64)
+    
+    def score_batch(self, repos):
+        """Score a page of repos at once with NumPy; matches assess_innovation_potential exactly"""
+        if not repos:
+            return []
+        score = np.zeros(len(repos), dtype=np.int64)
+        
+        # Recent creation: whole days old < RECENT_REPO_DAYS is the same as age in seconds below the cutoff
+        created = np.array([repo.created_at.replace('Z', '') for repo in repos], dtype='datetime64[s]')
+        age = time.time() - created.astype(np.int64)
+        score += np.where(age < RECENT_REPO_DAYS * 86400, 20, 0)
+        
+        # Star momentum
+        score += np.minimum(np.array([repo.stargazers_count for repo in repos], dtype=np.int64), 30)
+        
+        # Keyword hit matrix: one column per keyword, one row per repo
+        hits = np.zeros((len(repos), len(self.keyword_matcher.keywords)), dtype=bool)
+        for row, repo in enumerate(repos):
+            hits[row, list(self.keyword_matcher.find(repo.description.lower()))] = True
+        score += hits @ self.keyword_points
+        
+        return np.minimum(score, 100).tolist()
+    
+    def assess_innovation_potential(self, repo):
+        """Assess innovation potential of GitHub repo"""
+        score = 0
+        
+        # Recent creation and activity
+        created_date = datetime.fromisoformat(repo.created_at.replace('Z', '+00:00'))
+        days_old = (datetime.now(created_date.tzinfo) - created_date).days
+        if days_old < RECENT_REPO_DAYS:
+            score += 20
+        
+        # Star momentum
+        score += min(repo.stargazers_count, 30)
+        
+        # Innovation keywords and technology relevance, matched as whole words
+        desc = repo.description.lower()
+        for index in self.keyword_matcher.find(desc):
+            score += int(self.keyword_points[index])
+        
+        return min(score, 100)
+    
+    def assess_patent_potential(self, repo, metadata=None):
+        """Assess patent potential of repository"""
+        return self.assess_patent_potential_batch([(repo, metadata)])[0]
+    
+    def assess_patent_potential_batch(self, items):
+        """Assess (repo, metadata) pairs, matching each against the prior-art index in batches"""
+        factors = [{
+            'novelty': 'High - unique approach',
+            'non_obviousness': 'Medium - some existing solutions',
+            'utility': 'High - practical applications',
+            'enablement': 'High - well documented'
+        } for _ in items]
+        if not items or not self.prior_art or not self.prior_art.exists():
+            return factors
+        
+        texts = []
+        for repo, metadata in items:
+            metadata = metadata or {}
+            texts.append(' '.join([repo.description, ' '.join(metadata.get('topics', [])),
+                                   metadata.get('readme', '')[:PRIOR_ART_README_CHARS]]))
+        # The LSH shortlist plus rare-term postings keep exact BM25 scoring sub-linear in the corpus size
+        candidates = None
+        if self.near_duplicates and self.near_duplicates.exists():
+            candidates = self.near_duplicates.candidates(texts, self.shortlist_size)
+        for factor, prior_art in zip(factors, self.prior_art.top_matches(texts, self.prior_art_top_k, candidates)):
+            novelty = round(100 * (1 - prior_art['similarity']))
+            label = 'High' if novelty >= 70 else 'Medium' if novelty >= 40 else 'Low'
+            closest = prior_art['matches'][0][0] if prior_art['matches'] else None
+            factor['novelty'] = f"{label} - closest prior art {closest}" if closest else f"{label} - no prior art found"
+            factor['novelty_score'] = novelty
+            factor['prior_art'] = prior_art['matches']
+        return factors
+
+# Per-process scorer, created by the pool initializer in each worker
+worker_scorer = None
+
+def init_scoring_worker(scorer):
+    global worker_scorer
+    worker_scorer = scorer
+
+def score_chunk(method, repos):
+    """Run a batch scoring method of the worker's scorer over one chunk of repos"""
+    return getattr(worker_scorer, method)(repos)
+
+class ScoringPool:
+    """Pipeline stage that fans batch scoring out to a process pool in chunks"""
+    def __init__(self, scorer, workers=None, chunk_size=250, min_pool_batch=500):
+        self.scorer = scorer
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_pool_batch = min_pool_batch
+        self.executor = None
+        self.stats = {'pooled_batches': 0, 'inline_batches': 0, 'chunks': 0}
+    
+    def use_pool(self, repos):
+        # Small batches are cheaper in-process than a pickling round trip
+        return self.workers > 1 and len(repos) >= self.min_pool_batch
+    
+    def start(self):
+        if self.executor is None:
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers, initializer=init_scoring_worker, initargs=(self.scorer,))
+        return self.executor
+    
+    def chunks(self, repos):
+        for start in range(0, len(repos), self.chunk_size):
+            yield start, repos[start:start + self.chunk_size]
+    
+    def run(self, method, repos):
+        """Score repos with a batch method, keeping input order"""
+        return [result for _, result in self.imap(method, repos, ordered=True)]
+    
+    def imap(self, method, repos, ordered=True):
+        """Yield (index, result) per repo, in input order or as chunks finish"""
+        if not self.use_pool(repos):
+            self.stats['inline_batches'] += 1
+            yield from enumerate(getattr(self.scorer, method)(repos))
+            return
+        
+        self.stats['pooled_batches'] += 1
+        executor = self.start()
+        futures = {}
+        for start, chunk in self.chunks(repos):
+            futures[executor.submit(score_chunk, method, chunk)] = start
+            self.stats['chunks'] += 1
+        done = futures if ordered else concurrent.futures.as_completed(futures)
+        for future in done:
+            start = futures[future]
+            for offset, result in enumerate(future.result()):
+                yield start + offset, result
+    
+    async def run_async(self, method, repos):
+        """Score repos with a batch method without blocking the event loop on pooled chunks"""
+        if not self.use_pool(repos):
+            self.stats['inline_batches'] += 1
+            return getattr(self.scorer, method)(repos)
+        
+        self.stats['pooled_batches'] += 1
+        executor = self.start()
+        chunks = list(self.chunks(repos))
+        self.stats['chunks'] += len(chunks)
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(executor.submit(score_chunk, method, chunk)) for _, chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+    
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+class BulkGrantParser:
+    """Streaming parsers for USPTO bulk grant files that hold one patent in memory at a time"""
+    @staticmethod
+    def normalize_patent_id(number, country='US'):
+        # '07654321' and '7654321' are the same grant, as are 'D0912345' (ipg XML) and 'D912345' (PatentsView);
+        # design/reissue/plant prefixes are kept
+        number = number.strip()
+        if number.startswith(country):
+            number = number[len(country):]
+        match = re.fullmatch(r'([A-Za-z]*)0*(\d+)', number)
+        if match:
+            number = f"{match.group(1).upper()}{match.group(2)}"
+        return f"{country}{number}"
+    
+    @staticmethod
+    def application_key(number, country='US'):
+        # '10/123,456' and '10123456' are the same application
+        return f"{(country or 'US').strip()}{re.sub(r'[^0-9A-Za-z]', '', number)}"
+    
+    @staticmethod
+    def cpc_code(code):
+        # 'G06N 3/08' and 'G06N3/08' are the same group
+        return ''.join(code.split())
+    
+    @staticmethod
+    def iso_date(value):
+        """Normalize YYYYMMDD or YYYY-MM-DD to ISO; None unless it is a real calendar date"""
+        value = (value or '').strip()
+        if len(value) == 8 and value.isdigit():
+            value = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+        # Bulk files carry placeholders like 00000000 and the odd impossible date like 20050230
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+        except ValueError:
+            return None
+    
+    @classmethod
+    def iter_xml(cls, stream, stats):
+        """Yield grants from a weekly ipg file: many XML documents concatenated into one"""
+        parser = None
+        for line in stream:
+            # Each grant is a separate document with its own declaration
+            if line.startswith(b'<?xml'):
+                parser = ET.XMLPullParser(events=('end',))
+            if parser is None:
+                continue
+            try:
+                parser.feed(line)
+                for _, elem in parser.read_events():
+                    if elem.tag == 'us-patent-grant':
+                        yield cls.grant_fields(elem)
+                        elem.clear()
+            except ET.ParseError:
+                stats['errors'] += 1
+                parser = None
+    
+    @classmethod
+    def grant_fields(cls, grant):
+        """Extract the stored columns from a us-patent-grant element"""
+        def text(path):
+            elem = grant.find(path)
+            return ' '.join(''.join(elem.itertext()).split()) if elem is not None else None
+        
+        bib = 'us-bibliographic-data-grant'
+        term = f'{bib}/us-term-of-grant'
+        return {
+            'patent_id': cls.normalize_patent_id(
+                text(f'{bib}/publication-reference/document-id/doc-number') or '',
+                text(f'{bib}/publication-reference/document-id/country') or 'US'),
+            'kind': text(f'{bib}/publication-reference/document-id/kind'),
+            'title': text(f'{bib}/invention-title'),
+            'abstract': text('abstract'),
+            'claims': text('claims'),
+            'grant_date': cls.iso_date(text(f'{bib}/publication-reference/document-id/date')),
+            'filing_date': cls.iso_date(text(f'{bib}/application-reference/document-id/date')),
+            'application_id': text(f'{bib}/application-reference/document-id/doc-number'),
+            'term_extension': int(text(f'{term}/us-term-extension') or 0),
+            'terminal_disclaimer': int(grant.find(f'{term}/disclaimer') is not None),
+            'term_years': text(f'{term}/length-of-grant'),
+            'citations': cls.cited_patents(grant.find(bib)),
+            'priorities': cls.priority_applications(grant.find(bib)),
+            'cpc': [
+                f"{cpc.findtext('section')}{cpc.findtext('class')}{cpc.findtext('subclass')}"
+                f"{cpc.findtext('main-group')}/{cpc.findtext('subgroup')}"
+                for cpc in grant.iterfind(f'{bib}/classifications-cpc/*/classification-cpc')],
+        }
+    
+    @classmethod
+    def priority_applications(cls, bib):
+        """Foreign priority, parent (continuation/divisional) and provisional applications a grant claims"""
+        if bib is None:
+            return []
+        documents = (list(bib.iterfind('priority-claims/priority-claim'))
+                     + list(bib.iterfind('us-related-documents//parent-doc/document-id'))
+                     + list(bib.iterfind('us-related-documents/us-provisional-application/document-id')))
+        return [cls.application_key(doc.findtext('doc-number'), doc.findtext('country'))
+                for doc in documents if (doc.findtext('doc-number') or '').strip()]
+    
+    @classmethod
+    def cited_patents(cls, bib):
+        """US grants cited by a patent (us-references-cited, or references-cited in pre-2013 files)"""
+        if bib is None:
+            return []
+        cited = []
+        for doc in bib.iterfind('*/*/patcit/document-id'):
+            # Published applications (kind A1/A2...) and foreign documents are not grants in the corpus
+            if doc.findtext('country', 'US') != 'US' or (doc.findtext('kind') or '').startswith('A'):
+                continue
+            number = (doc.findtext('doc-number') or '').strip()
+            if number:
+                cited.append(cls.normalize_patent_id(number))
+        return cited
+    
+    @classmethod
+    def iter_tsv(cls, stream, stats):
+        """Yield the recognised columns of each row of a tab-separated bulk file"""
+        reader = csv.reader((line.decode('utf-8', 'replace') for line in stream), delimiter='\t')
+        header = next(reader, [])
+        columns = [(index, TSV_COLUMNS[name]) for index, name in enumerate(header) if name in TSV_COLUMNS]
+        for row in reader:
+            if len(row) != len(header):
+                stats['errors'] += 1
+                continue
+            fields = {column: row[index] or None for index, column in columns}
+            if not fields.get('patent_id'):
+                continue
+            fields['patent_id'] = cls.normalize_patent_id(fields['patent_id'])
+            # Citation and priority rows describe the other document, so only the link itself is kept
+            if 'citations' in fields:
+                cited = fields['citations']
+                yield {'patent_id': fields['patent_id'], 'citations': [cls.normalize_patent_id(cited)] if cited else []}
+                continue
+            if 'priorities' in fields:
+                application = fields['priorities']
+                yield {'patent_id': fields['patent_id'], 'priorities':
+                       [cls.application_key(application, fields.get('priority_country'))] if application else []}
+                continue
+            if 'cpc' in fields:
+                code = fields['cpc']
+                yield {'patent_id': fields['patent_id'], 'cpc': [cls.cpc_code(code)] if code else []}
+                continue
+            for column in ('grant_date', 'filing_date', 'disclaimer_date'):
+                if column in fields:
+                    fields[column] = cls.iso_date(fields[column])
+            # PatentsView gives the disclaimer text; any text means a terminal disclaimer
+            if 'terminal_disclaimer' in fields:
+                fields['terminal_disclaimer'] = int(bool(fields['terminal_disclaimer']))
+            yield fields
+    
+    @classmethod
+    def iter_file(cls, path, stats):
+        """Yield grants from an .xml or .tsv file, or from those members of a .zip"""
+        if path.endswith('.zip'):
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    with archive.open(name) as stream:
+                        yield from cls.iter_stream(name, stream, stats)
+        else:
+            with open(path, 'rb') as stream:
+                yield from cls.iter_stream(path, stream, stats)
+    
+    @classmethod
+    def iter_stream(cls, name, stream, stats):
+        if name.endswith('.xml'):
+            yield from cls.iter_xml(stream, stats)
+        elif name.endswith('.tsv'):
+            yield from cls.iter_tsv(stream, stats)
+
+class MaintenanceFeeParser:
+    """Zero-copy parser for the USPTO maintenance-fee events file, memory-mapped as fixed-width records"""
+    @staticmethod
+    def record_dtype(record_length):
+        names = list(MAINT_FEE_FIELDS)
+        return np.dtype({
+            'names': names,
+            'formats': [f'S{MAINT_FEE_FIELDS[name][1]}' for name in names],
+            'offsets': [MAINT_FEE_FIELDS[name][0] for name in names],
+            'itemsize': record_length})
+    
+    @staticmethod
+    def lapse_events(records):
+        """(patent numbers, dates, codes) of the lapse-related records"""
+        codes = np.char.strip(records['event_code'])
+        relevant = np.isin(codes, list(LAPSE_CODES | REINSTATEMENT_CODES))
+        # Only the (few) lapse-related events are copied out of the map
+        return records['patent_number'][relevant], records['event_date'][relevant], codes[relevant]
+    
+    @classmethod
+    def lapse_status(cls, path, stats):
+        """Map patent ids to ('lapsed' | 'reinstated', ISO date) from their latest lapse-related event"""
+        # mmap cannot map an empty file
+        if not os.path.getsize(path):
+            return {}
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # A file without a trailing newline ends in a short record
+            record_length = mm.find(b'\n') + 1 or max(len(mm), MAINT_FEE_RECORD_MIN)
+            whole = len(mm) // record_length
+            dtype = cls.record_dtype(record_length)
+            # A structured view straight over the mapped pages: no per-line Python strings
+            records = np.frombuffer(mm, dtype=dtype, count=whole)
+            numbers, dates, codes = cls.lapse_events(records)
+            stats['fee_events'] += len(records)
+            del records
+            
+            tail = mm[whole * record_length:]
+            # Trailing blanks may be trimmed, but the event code has to have started
+            if len(tail) > MAINT_FEE_FIELDS['event_code'][0]:
+                last = np.frombuffer(tail.ljust(record_length, b' '), dtype=dtype)
+                numbers, dates, codes = (
+                    np.concatenate(columns) for columns in zip((numbers, dates, codes), cls.lapse_events(last)))
+                stats['fee_events'] += 1
+        
+        status = {}
+        for index in np.argsort(dates, kind='stable'):
+            patent_id = BulkGrantParser.normalize_patent_id(numbers[index].decode())
+            date = BulkGrantParser.iso_date(dates[index].decode())
+            status[patent_id] = ('lapsed' if codes[index] in LAPSE_CODES else 'reinstated', date)
+        return status
+
+class PatentStore:
+    """SQLite store of ingested patent grants, filled incrementally from a bulk-file directory"""
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS patents ({', '.join(PATENT_FIELDS)}, PRIMARY KEY (patent_id))")
+        # Files already ingested are skipped unless they change on disk
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS ingested_files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL, patents INTEGER)")
+        # Older stores lack newer columns: add them and re-ingest every file to fill them in
+        existing = {row[1] for row in self.db.execute("PRAGMA table_info(patents)")}
+        missing = [column for column in PATENT_FIELDS if column not in existing]
+        for column in missing:
+            self.db.execute(f"ALTER TABLE patents ADD COLUMN {column}")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS maintenance_status (patent_id TEXT PRIMARY KEY, status TEXT, event_date TEXT)")
+        # Citation graph: patent ids become dense integer nodes so edges load straight into arrays
+        new_tables = [name for name in ('citations', 'priority_claims', 'cpc_codes')
+                      if not self.db.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone()]
+        self.db.execute("CREATE TABLE IF NOT EXISTS citation_nodes (node INTEGER PRIMARY KEY, patent_id TEXT UNIQUE)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS citations (citing INTEGER, cited INTEGER, PRIMARY KEY (citing, cited)) WITHOUT ROWID")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS priority_claims (patent_id TEXT, application TEXT, "
+            "PRIMARY KEY (patent_id, application)) WITHOUT ROWID")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cpc_codes (patent_id TEXT, code TEXT, PRIMARY KEY (patent_id, code)) WITHOUT ROWID")
+        if missing or new_tables:
+            self.db.execute("DELETE FROM ingested_files")
+            self.db.commit()
+        self.create_text_index()
+        self.normalize_stored_ids()
+        self.stats = {
+            'files': 0, 'patents': 0, 'citations': 0, 'errors': 0, 'seconds': 0.0,
+            'fee_files': 0, 'fee_events': 0, 'lapsed': 0, 'fee_seconds': 0.0
+        }
+    
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM patents").fetchone()[0]
+    
+    def normalize_stored_ids(self):
+        """Rewrite zero-padded design/reissue/plant ids stored by older versions ('USD0912345' -> 'USD912345')"""
+        padded = ' OR '.join(f"patent_id GLOB 'US{prefix}0*'" for prefix in ('D', 'RE', 'PP', 'H', 'T', 'X', 'AI'))
+        tables = ('patents', 'priority_claims', 'cpc_codes', 'citation_nodes')
+        if not any(self.db.execute(f"SELECT 1 FROM {table} WHERE {padded} LIMIT 1").fetchone() for table in tables):
+            return
+        self.db.create_function('normalize_patent_id', 1, BulkGrantParser.normalize_patent_id, deterministic=True)
+        for table in tables:
+            # Where the unpadded id is already stored (the same grant from a TSV), the padded copy goes
+            self.db.execute(f"UPDATE OR IGNORE {table} SET patent_id = normalize_patent_id(patent_id) WHERE {padded}")
+            self.db.execute(f"DELETE FROM {table} WHERE {padded}")
+        # Re-ingest so the surviving rows get the fields the deleted copies had
+        self.db.execute("DELETE FROM ingested_files")
+        self.db.commit()
+    
+    def create_text_index(self):
+        """Create the FTS5 index over titles, abstracts and claims, kept in sync by triggers"""
+        if self.db.execute("SELECT 1 FROM sqlite_master WHERE name = 'patents_fts'").fetchone():
+            return
+        columns = ', '.join(PATENT_TEXT_FIELDS)
+        old = ', '.join(f"old.{column}" for column in PATENT_TEXT_FIELDS)
+        new = ', '.join(f"new.{column}" for column in PATENT_TEXT_FIELDS)
+        # External content: the text lives once, in patents; the index holds only postings
+        self.db.executescript(f"""
+            CREATE VIRTUAL TABLE patents_fts USING fts5(
+                {columns}, content='patents', content_rowid='rowid', tokenize='porter unicode61');
+            CREATE TRIGGER patents_fts_insert AFTER INSERT ON patents BEGIN
+                INSERT INTO patents_fts (rowid, {columns}) VALUES (new.rowid, {new});
+            END;
+            CREATE TRIGGER patents_fts_delete AFTER DELETE ON patents BEGIN
+                INSERT INTO patents_fts (patents_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old});
+            END;
+            CREATE TRIGGER patents_fts_update AFTER UPDATE ON patents BEGIN
+                INSERT INTO patents_fts (patents_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old});
+                INSERT INTO patents_fts (rowid, {columns}) VALUES (new.rowid, {new});
+            END;
+            INSERT INTO patents_fts (patents_fts) VALUES ('rebuild');
+        """)
+    
+    @staticmethod
+    def match_expression(text):
+        """Turn free text into an FTS5 query matching every word; quoted text stays a phrase"""
+        text = text.strip()
+        if len(text) > 1 and text[0] == text[-1] == '"':
+            return '"%s"' % text[1:-1].replace('"', '""')
+        return ' '.join(f'"{term}"' for term in re.findall(r'\w+', text))
+    
+    def search(self, text, limit=20):
+        """Count the grants matching a keyword/phrase query and return the best-ranked ids"""
+        expression = self.match_expression(text)
+        if not expression:
+            return PatentSearchResult(query=text, count=0, patent_ids=[])
+        count = self.db.execute(
+            "SELECT COUNT(*) FROM patents_fts WHERE patents_fts MATCH ?", (expression,)).fetchone()[0]
+        # bm25 rank: a title hit weighs more than an abstract hit, and both more than claims
+        patent_ids = [row[0] for row in self.db.execute(
+            "SELECT patents.patent_id FROM patents_fts JOIN patents ON patents.rowid = patents_fts.rowid "
+            "WHERE patents_fts MATCH ? ORDER BY bm25(patents_fts, 10.0, 5.0, 1.0) LIMIT ?",
+            (expression, limit))]
+        return PatentSearchResult(query=text, count=count, patent_ids=patent_ids)
+    
+    def upsert(self, columns, rows):
+        """Insert grants, or fill in the given columns of grants already stored"""
+        # Values missing from this file never erase ones another file provided
+        updates = ', '.join(
+            f"{column} = COALESCE(excluded.{column}, {column})" for column in columns if column != 'patent_id')
+        self.db.executemany(
+            f"INSERT INTO patents ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(patent_id) DO {f'UPDATE SET {updates}' if updates else 'NOTHING'}",
+            rows)
+    
+    def max_rowid(self):
+        return self.db.execute("SELECT COALESCE(MAX(rowid), 0) FROM patents").fetchone()[0]
+    
+    def ingest_directory(self, directory, batch_size=5000):
+        """Ingest every new or changed bulk file in the directory"""
+        if not os.path.isdir(directory):
+            return self.stats
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(('.xml', '.tsv', '.zip')) and not MAINT_FEE_FILE.match(name):
+                continue
+            path = os.path.join(directory, name)
+            info = os.stat(path)
+            done = self.db.execute(
+                "SELECT 1 FROM ingested_files WHERE path = ? AND size = ? AND mtime = ?",
+                (path, info.st_size, info.st_mtime)).fetchone()
+            if not done:
+                if MAINT_FEE_FILE.match(name):
+                    patents = self.ingest_maintenance_fees(path)
+                else:
+                    patents = self.ingest_file(path, batch_size)
+                self.db.execute(
+                    "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?, ?)",
+                    (path, info.st_size, info.st_mtime, patents))
+                self.db.commit()
+        return self.stats
+    
+    def ingest_file(self, path, batch_size=5000):
+        """Stream one bulk file into the store in batches, returning the number of new grants"""
+        started = time.perf_counter()
+        # PatentsView spreads a grant over several files, so rows upserted overcount; new rowids do not
+        last_rowid = self.max_rowid()
+        batch, columns = [], None
+        # Per-grant lists that go to their own tables as (patent_id, value) pairs
+        links = {'citations': [], 'priorities': [], 'cpc': []}
+        writers = {'citations': self.add_citations, 'priorities': self.add_priority_claims, 'cpc': self.add_cpc_codes}
+        for fields in BulkGrantParser.iter_file(path, self.stats):
+            for name, pairs in links.items():
+                pairs.extend((fields['patent_id'], value) for value in fields.pop(name, ()))
+                if len(pairs) >= batch_size:
+                    writers[name](pairs)
+                    pairs.clear()
+            # Rows of a citation, priority or CPC file carry nothing but the pairs
+            if len(fields) == 1:
+                continue
+            # Rows of one file share their columns; flush when that changes or the batch fills
+            if columns != tuple(fields) or len(batch) >= batch_size:
+                if batch:
+                    self.upsert(columns, batch)
+                batch, columns = [], tuple(fields)
+            batch.append(tuple(fields.values()))
+        if batch:
+            self.upsert(columns, batch)
+        for name, pairs in links.items():
+            if pairs:
+                writers[name](pairs)
+        count = self.max_rowid() - last_rowid
+        self.stats['files'] += 1
+        self.stats['patents'] += count
+        self.stats['seconds'] += time.perf_counter() - started
+        return count
+    
+    def add_citations(self, pairs):
+        """Store (citing, cited) patent id pairs as edges between integer nodes"""
+        before = self.db.total_changes
+        self.db.executemany(
+            "INSERT OR IGNORE INTO citation_nodes (patent_id) VALUES (?)",
+            ((patent_id,) for pair in pairs for patent_id in pair))
+        nodes_added = self.db.total_changes - before
+        self.db.executemany(
+            "INSERT OR IGNORE INTO citations SELECT citing.node, cited.node "
+            "FROM citation_nodes AS citing, citation_nodes AS cited WHERE citing.patent_id = ? AND cited.patent_id = ?",
+            pairs)
+        self.stats['citations'] += self.db.total_changes - before - nodes_added
+    
+    def add_priority_claims(self, pairs):
+        """Store (patent_id, application key) pairs linking a grant to the applications it claims"""
+        self.db.executemany("INSERT OR IGNORE INTO priority_claims VALUES (?, ?)", pairs)
+    
+    def add_cpc_codes(self, pairs):
+        """Store (patent_id, CPC group) pairs"""
+        self.db.executemany("INSERT OR IGNORE INTO cpc_codes VALUES (?, ?)", pairs)
+    
+    def ingest_maintenance_fees(self, path):
+        """Replace the patent status table from a full maintenance-fee events file"""
+        started = time.perf_counter()
+        events = self.stats['fee_events']
+        status = MaintenanceFeeParser.lapse_status(path, self.stats)
+        # An empty (e.g. truncated) download must not wipe the statuses already known
+        if self.stats['fee_events'] == events:
+            return 0
+        # Each file is a complete history, so it supersedes the previous table
+        self.db.execute("DELETE FROM maintenance_status")
+        self.db.executemany(
+            "INSERT INTO maintenance_status VALUES (?, ?, ?)",
+            ((patent_id, state, date) for patent_id, (state, date) in status.items()))
+        lapsed = sum(state == 'lapsed' for state, _ in status.values())
+        # Counted apart from grant files: lapse status only feeds the expiry index
+        self.stats['fee_files'] += 1
+        self.stats['lapsed'] += lapsed
+        self.stats['fee_seconds'] += time.perf_counter() - started
+        return lapsed
+    
+    def throughput(self):
+        return self.stats['patents'] / self.stats['seconds'] if self.stats['seconds'] else 0.0
+    
+    def iter_term_rows(self, chunk_size=500000):
+        """Yield chunks of (rowid, patent_id, kind, term inputs..., lapse date) for the expiration calculator"""
+        cursor = self.db.execute(
+            "SELECT patents.rowid, patents.patent_id, kind, filing_date, grant_date, term_extension, "
+            "terminal_disclaimer, disclaimer_date, term_years, "
+            "CASE WHEN status = 'lapsed' THEN event_date END "
+            "FROM patents LEFT JOIN maintenance_status USING (patent_id)")
+        while rows := cursor.fetchmany(chunk_size):
+            yield rows
+    
+    def iter_text_rows(self, columns, chunk_size=50000, after_rowid=0):
+        """Yield chunks of (patent_id, *columns) rows in rowid order, optionally only those after a rowid"""
+        cursor = self.db.execute(
+            f"SELECT patent_id, {', '.join(columns)} FROM patents WHERE rowid > ? ORDER BY rowid", (after_rowid,))
+        while rows := cursor.fetchmany(chunk_size):
+            yield rows
+    
+    def citation_graph_size(self):
+        """(nodes, edges) of the citation graph"""
+        nodes = self.db.execute("SELECT MAX(node) FROM citation_nodes").fetchone()[0] or 0
+        return nodes, self.db.execute("SELECT COUNT(*) FROM citations").fetchone()[0]
+    
+    def iter_citations(self, chunk_size=1000000):
+        """Yield chunks of (citing, cited) zero-based node arrays"""
+        # One packed integer per edge halves the Python objects SQLite hands back
+        cursor = self.db.execute("SELECT ((citing - 1) << 32) | (cited - 1) FROM citations")
+        while rows := cursor.fetchmany(chunk_size):
+            packed = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            yield packed >> 32, packed & 0xFFFFFFFF
+    
+    def citation_node_rowids(self):
+        """Zero-based citation nodes of the patents in the corpus, and their rowids"""
+        pairs = np.array(self.db.execute(
+            "SELECT node - 1, patents.rowid FROM patents JOIN citation_nodes USING (patent_id)").fetchall(),
+            dtype=np.int64).reshape(-1, 2)
+        return pairs[:, 0], pairs[:, 1]
+    
+    def iter_family_links(self, chunk_size=500000):
+        """Yield chunks of (rowid, application key) linking each grant to its own and claimed applications"""
+        cursor = self.db.execute(
+            "SELECT rowid, application_id, 1 FROM patents WHERE application_id IS NOT NULL "
+            "UNION ALL SELECT patents.rowid, application, 0 FROM priority_claims JOIN patents USING (patent_id)")
+        while rows := cursor.fetchmany(chunk_size):
+            # Claims are stored as keys already; the grant's own application number is raw
+            yield [(rowid, BulkGrantParser.application_key(application) if raw else application)
+                   for rowid, application, raw in rows]
+    
+    def iter_cpc_postings(self, chunk_size=500000):
+        """Yield chunks of (CPC code, rowid) ordered by code, then rowid"""
+        cursor = self.db.execute(
+            "SELECT code, patents.rowid FROM cpc_codes JOIN patents USING (patent_id) ORDER BY code, patents.rowid")
+        while rows := cursor.fetchmany(chunk_size):
+            yield rows
+    
+    def rowids(self):
+        """Every patent rowid, ascending"""
+        return np.array([row[0] for row in self.db.execute("SELECT rowid FROM patents ORDER BY rowid")], dtype=np.int64)
+    
+    def fetch(self, rowids):
+        """Map rowids to (patent_id, title, filing_date, grant_date, lapse date)"""
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(rowids), 900):
+            chunk = [int(rowid) for rowid in rowids[start:start + 900]]
+            found.update((row[0], row[1:]) for row in self.db.execute(
+                f"SELECT patents.rowid, patents.patent_id, title, filing_date, grant_date, "
+                f"CASE WHEN status = 'lapsed' THEN event_date END "
+                f"FROM patents LEFT JOIN maintenance_status USING (patent_id) "
+                f"WHERE patents.rowid IN ({', '.join('?' * len(chunk))})", chunk))
+        return found
+    
+    def close(self):
+        self.db.close()
+
+class ExpirationCalculator:
+    """Vectorized patent expiry dates from filing/grant dates and term adjustments"""
+    @staticmethod
+    def add_years(dates, years):
+        """Add whole calendar years to datetime64[D] dates (Feb 29 rolls to Mar 1)"""
+        months = dates.astype('datetime64[M]')
+        return (months + np.asarray(years) * 12).astype('datetime64[D]') + (dates - months.astype('datetime64[D]'))
+    
+    @staticmethod
+    def dates(values):
+        """Convert ISO date strings to datetime64[D], turning any invalid one into NaT"""
+        try:
+            return np.array(values, dtype='datetime64[D]')
+        except ValueError:
+            # Rows ingested before dates were validated can still hold them
+            return np.array([BulkGrantParser.iso_date(value) for value in values], dtype='datetime64[D]')
+    
+    @classmethod
+    def expiry_dates(cls, rows):
+        """Compute expiry for (rowid, patent_id, kind, filing, grant, extension, disclaimer, disclaimed, years, lapsed) rows"""
+        _, patent_ids, kinds, filing, grant, extension, disclaimer, disclaimed, years, lapsed = zip(*rows)
+        filing = cls.dates(filing)
+        grant = cls.dates(grant)
+        disclaimed = cls.dates(disclaimed)
+        extension = np.array([int(days or 0) for days in extension], dtype=np.int64)
+        disclaimer = np.array([bool(flag) for flag in disclaimer])
+        length = np.array([int(term) if str(term or '').isdigit() else 0 for term in years], dtype=np.int64)
+        design = np.array([(kind or '').startswith('S') or patent_id.startswith('USD')
+                           for patent_id, kind in zip(patent_ids, kinds)])
+        
+        # Utility and plant: 20 years from filing plus term adjustment, which a terminal
+        # disclaimer caps at the referenced patent's term (unknown here, so none is added)
+        expiry = cls.add_years(filing, 20) + np.where(disclaimer, 0, extension).astype('timedelta64[D]')
+        old = filing < np.datetime64(URAA_DATE)
+        expiry = np.where(old, np.maximum(expiry, cls.add_years(grant, 17)), expiry)
+        
+        # Design: 14 or 15 years from grant unless the grant states its length
+        design_years = np.where(length > 0, length, np.where(filing < np.datetime64(HAGUE_DATE), 14, 15))
+        expiry = np.where(design, cls.add_years(grant, design_years), expiry)
+        
+        # A dated disclaimer gives up the term after that date, and an unpaid maintenance fee ends it early
+        for cutoff in (disclaimed, cls.dates(lapsed)):
+            expiry = np.where(np.isnat(cutoff), expiry, np.minimum(expiry, cutoff))
+        return expiry
+
+class CitationRank:
+    """PageRank and forward-citation counts of the corpus's patents, recomputed only when the graph changes"""
+    def __init__(self, directory, damping=0.85, tolerance=1e-10, max_iterations=100):
+        self.directory = directory
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.rowids = self.influence = self.forward_citations = None
+        self.percentiles = None
+    
+    def graph_path(self):
+        return os.path.join(self.directory, 'graph.json')
+    
+    def exists(self):
+        return os.path.exists(self.graph_path())
+    
+    def graph(self):
+        with open(self.graph_path()) as f:
+            return json.load(f)
+    
+    def current(self, nodes, edges, patents):
+        """Whether the cached ranks were computed from this graph over this corpus"""
+        if not self.exists():
+            return False
+        graph = self.graph()
+        return (graph['nodes'], graph['edges'], graph['patents']) == (nodes, edges, patents)
+    
+    def build(self, store):
+        """Load the graph into a sparse transition matrix and run PageRank by power iteration"""
+        nodes, edges = store.citation_graph_size()
+        citing, cited = [], []
+        for citing_chunk, cited_chunk in store.iter_citations():
+            citing.append(citing_chunk)
+            cited.append(cited_chunk)
+        citing = np.concatenate(citing) if citing else np.empty(0, dtype=np.int64)
+        cited = np.concatenate(cited) if cited else np.empty(0, dtype=np.int64)
+        
+        out_degree = np.bincount(citing, minlength=nodes)
+        forward_citations = np.bincount(cited, minlength=nodes)
+        # Column-stochastic: a patent passes its rank on, split evenly, to the patents it cites
+        transition = scipy.sparse.csr_matrix(
+            (1.0 / out_degree[citing], (cited, citing)), shape=(nodes, nodes))
+        dangling = out_degree == 0
+        rank = np.full(nodes, 1.0 / max(nodes, 1))
+        iterations = 0
+        while iterations < self.max_iterations:
+            iterations += 1
+            # Patents citing nothing spread their rank over the whole graph
+            updated = self.damping * (transition @ rank + rank[dangling].sum() / nodes) + (1 - self.damping) / nodes
+            delta = np.abs(updated - rank).sum()
+            rank = updated
+            if delta < self.tolerance:
+                break
+        
+        node_ids, rowids = store.citation_node_rowids()
+        order = np.argsort(rowids)
+        node_ids, rowids = node_ids[order], rowids[order]
+        # 1.0 is the average patent in the graph
+        influence = rank[node_ids] * nodes
+        save_columns(self.directory, {
+            'rowids': rowids, 'influence': influence, 'forward_citations': forward_citations[node_ids]})
+        graph = {
+            'nodes': nodes, 'edges': edges, 'patents': len(store), 'iterations': iterations,
+            # Corpus percentiles behind the market_potential labels
+            'high_influence': float(np.percentile(influence, 90)) if len(influence) else 0.0,
+            'medium_influence': float(np.percentile(influence, 50)) if len(influence) else 0.0
+        }
+        # graph.json goes last: it marks a complete, current cache
+        save_json(self.graph_path(), graph)
+        self.rowids = self.influence = self.forward_citations = None
+        self.percentiles = None
+        return graph
+    
+    def load(self):
+        if self.rowids is None:
+            self.rowids, self.influence, self.forward_citations = load_columns(
+                self.directory, ('rowids', 'influence', 'forward_citations'))
+            graph = self.graph()
+            self.percentiles = (graph['high_influence'], graph['medium_influence'])
+    
+    def lookup(self, rowids):
+        """(influence, forward citations) per rowid; patents outside the graph get zeros"""
+        self.load()
+        rowids = np.asarray(rowids, dtype=np.int64)
+        if not len(self.rowids):
+            return np.zeros(len(rowids)), np.zeros(len(rowids), dtype=np.int64)
+        at = np.minimum(np.searchsorted(self.rowids, rowids), len(self.rowids) - 1)
+        found = self.rowids[at] == rowids
+        return np.where(found, self.influence[at], 0.0), np.where(found, self.forward_citations[at], 0)
+    
+    def potential(self, influence):
+        """Market-potential label from where a patent's influence falls in the corpus"""
+        self.load()
+        high, medium = self.percentiles
+        if influence >= high:
+            return 'High - top 10% by citation influence'
+        if influence >= medium:
+            return 'Medium - above median citation influence'
+        return 'Low - below median citation influence'
+
+class UnionFind:
+    """Array-backed disjoint sets with path compression and union by size"""
+    def __init__(self, size=0):
+        self.parent = array('q', range(size))
+        self.size = array('q', [1]) * size
+    
+    def add(self):
+        """Create a singleton set and return its node"""
+        node = len(self.parent)
+        self.parent.append(node)
+        self.size.append(1)
+        return node
+    
+    def find(self, node):
+        parent = self.parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression: every node on the way now points straight at the root
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+    
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+class FamilyIndex:
+    """Patent families (grants sharing any application or priority claim), stored as family ids by rowid"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.rowids = self.families = self.sorted_families = self.members_by_family = None
+    
+    def exists(self):
+        return os.path.exists(column_path(self.directory, 'members_by_family'))
+    
+    def build(self, store):
+        """Union every grant with the applications it names; returns (patents, families)"""
+        rowids = store.rowids()
+        # Grants are nodes 0..max rowid; each distinct application becomes one more node
+        sets = UnionFind(int(rowids[-1]) + 1 if len(rowids) else 0)
+        applications = {}
+        for rows in store.iter_family_links():
+            for rowid, application in rows:
+                node = applications.get(application)
+                if node is None:
+                    node = applications[application] = sets.add()
+                sets.union(rowid, node)
+        # The smallest member rowid names the family, so ids do not depend on union order
+        roots = np.fromiter((sets.find(rowid) for rowid in rowids.tolist()), dtype=np.int64, count=len(rowids))
+        first = np.full(len(sets.parent), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first, roots, rowids)
+        families = first[roots]
+        
+        order = np.argsort(families, kind='stable')
+        # Family-sorted copies, so a family's members are one binary-searched slice
+        save_columns(self.directory, {
+            'rowids': rowids, 'families': families,
+            'sorted_families': families[order], 'members_by_family': rowids[order]
+        })
+        self.rowids = self.families = self.sorted_families = self.members_by_family = None
+        return len(rowids), len(np.unique(families))
+    
+    def load(self):
+        if self.rowids is None:
+            self.rowids, self.families, self.sorted_families, self.members_by_family = load_columns(
+                self.directory, ('rowids', 'families', 'sorted_families', 'members_by_family'))
+    
+    def family_of(self, rowids):
+        """Family id per rowid; rowids ingested after the last build are their own family"""
+        self.load()
+        rowids = np.asarray(rowids, dtype=np.int64)
+        if not len(self.rowids):
+            return rowids
+        at = np.minimum(np.searchsorted(self.rowids, rowids), len(self.rowids) - 1)
+        return np.where(self.rowids[at] == rowids, self.families[at], rowids)
+    
+    def members(self, family):
+        """Rowids of every grant in a family"""
+        self.load()
+        start = np.searchsorted(self.sorted_families, family, side='left')
+        end = np.searchsorted(self.sorted_families, family, side='right')
+        return np.array(self.members_by_family[start:end]) if end > start else np.array([family], dtype=np.int64)
+
+class CpcIndex:
+    """CPC group -> sorted patent rowid posting lists; a subtree is a contiguous run of sorted codes"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.codes = self.offsets = self.postings = None
+        self.universe = 0
+    
+    def info_path(self):
+        return os.path.join(self.directory, 'index.json')
+    
+    def exists(self):
+        return os.path.exists(self.info_path())
+    
+    def has_codes(self):
+        """Whether the index covers any CPC codes; a PatentsView corpus without g_cpc_current has none"""
+        if not self.exists():
+            return False
+        with open(self.info_path()) as f:
+            return json.load(f)['codes'] > 0
+    
+    def build(self, store):
+        """Write codes, their posting-list offsets and the concatenated posting lists; returns the code count"""
+        codes, postings = [], []
+        for rows in store.iter_cpc_postings():
+            codes.append(np.array([row[0] for row in rows], dtype='S24'))
+            postings.append(np.array([row[1] for row in rows], dtype=np.int64))
+        codes = np.concatenate(codes) if codes else np.empty(0, dtype='S24')
+        postings = np.concatenate(postings) if postings else np.empty(0, dtype=np.int64)
+        # Rows arrive sorted by code, so each code's postings are one slice
+        unique_codes, starts = np.unique(codes, return_index=True)
+        offsets = np.append(starts, len(postings)).astype(np.int64)
+        rowids = store.rowids()
+        
+        save_columns(self.directory, {'codes': unique_codes, 'offsets': offsets, 'postings': postings})
+        # index.json goes last: it marks a complete index
+        save_json(self.info_path(), {'universe': int(rowids[-1]) + 1 if len(rowids) else 0, 'codes': len(unique_codes)})
+        self.codes = self.offsets = self.postings = None
+        return len(unique_codes)
+    
+    def load(self):
+        if self.codes is None:
+            self.codes, self.offsets, self.postings = load_columns(self.directory, ('codes', 'offsets', 'postings'))
+            with open(self.info_path()) as f:
+                self.universe = json.load(f)['universe']
+    
+    @staticmethod
+    def prefix(code):
+        """Sort prefix of a CPC subtree: a main group like G06F9 must not also match G06F95"""
+        code = BulkGrantParser.cpc_code(code).upper()
+        return code.encode() if len(code) <= 4 or '/' in code else f"{code}/".encode()
+    
+    def bitmap(self, prefixes, size=None):
+        """Dense rowid bitmap of the union of the CPC subtrees"""
+        self.load()
+        bits = np.zeros(max(size or 0, self.universe), dtype=bool)
+        for prefix in map(self.prefix, prefixes):
+            # Every code starting with the prefix sorts between it and the prefix followed by 0xff
+            start = np.searchsorted(self.codes, prefix, side='left')
+            end = np.searchsorted(self.codes, prefix + b'\xff', side='left')
+            bits[self.postings[self.offsets[start]:self.offsets[end]]] = True
+        return bits
+    
+    def subtree(self, prefixes):
+        """Sorted rowids of the patents in the union of the CPC subtrees"""
+        return np.flatnonzero(self.bitmap(prefixes))
+    
+    def restrict(self, prefixes, rowids):
+        """Mask of the given rowids (e.g. an expiry window) that fall in the CPC subtrees"""
+        rowids = np.asarray(rowids, dtype=np.int64)
+        bits = self.bitmap(prefixes, int(rowids.max()) + 1 if len(rowids) else 0)
+        return bits[rowids]
+
+class ExpiryIndex:
+    """On-disk index of patent rowids sorted by expiry date, searched by binary search"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.days = None
+        self.rowids = None
+    
+    def exists(self):
+        return os.path.exists(column_path(self.directory, 'rowids'))
+    
+    def build(self, store):
+        """Compute every expiry in chunks and write both sorted columns"""
+        days, rowids = [], []
+        for rows in store.iter_term_rows():
+            expiry = ExpirationCalculator.expiry_dates(rows)
+            known = ~np.isnat(expiry)
+            days.append(expiry[known].astype(np.int32))
+            rowids.append(np.array([row[0] for row in rows], dtype=np.int64)[known])
+        days = np.concatenate(days) if days else np.empty(0, dtype=np.int32)
+        rowids = np.concatenate(rowids) if rowids else np.empty(0, dtype=np.int64)
+        order = np.argsort(days, kind='stable')
+        
+        save_columns(self.directory, {'expiry-days': days[order], 'rowids': rowids[order]})
+        self.days = self.rowids = None
+    
+    def load(self):
+        self.days, self.rowids = load_columns(self.directory, ('expiry-days', 'rowids'))
+    
+    def between(self, start, end):
+        """Return (rowids, expiry dates) expiring in [start, end], latest first"""
+        if self.days is None:
+            self.load()
+        low = np.searchsorted(self.days, np.datetime64(start, 'D').astype(np.int32), side='left')
+        high = np.searchsorted(self.days, np.datetime64(end, 'D').astype(np.int32), side='right')
+        return self.rowids[low:high][::-1], self.days[low:high][::-1].astype('datetime64[D]')
 
 class PatentScraper:
-    def __init__(self, github_token):
+    def __init__(self, github_token, **config):
         self.token = github_token
+        self.config = {**DEFAULT_CONFIG, **config}
         self.headers = {'Authorization': f'token {github_token}'}
+        self.session = self.create_session()
+        # Per-host counters of the aiohttp sessions, filled by their trace hooks
+        self.async_connections = {}
+        self.scheduler = RateLimitScheduler(
+            {
+                'search': (self.config['search_burst'], self.config['search_rate_per_minute'] / 60),
+                'core': (self.config['core_burst'], self.config['core_rate_per_hour'] / 3600),
+                'graphql': (self.config['graphql_burst'], self.config['graphql_rate_per_hour'] / 3600),
+            },
+            max_retries=self.config['max_retries'],
+            backoff_base=self.config['backoff_base'],
+            backoff_cap=self.config['backoff_cap'])
+        self.cache = None
+        if self.config['response_cache']:
+            self.cache = ResponseCache(
+                os.path.join(self.config['state_dir'], 'http-cache'), self.config['cache_max_bytes'])
+        self.scorer = InnovationScorer(
+            PriorArtIndex(
+                os.path.join(self.config['state_dir'], self.config['prior_art_index']),
+                topup_postings=self.config['prior_art_topup_postings']),
+            self.config['prior_art_top_k'],
+            NearDuplicateIndex(
+                os.path.join(self.config['state_dir'], self.config['near_duplicate_index']),
+                self.config['minhash_permutations'], self.config['minhash_bands']),
+            self.config['prior_art_shortlist'])
+        self.scoring_pool = ScoringPool(
+            self.scorer,
+            workers=self.config['scoring_workers'],
+            chunk_size=self.config['scoring_chunk_size'],
+            min_pool_batch=self.config['scoring_min_pool_batch'])
+        self.score_memo = None
+        if self.config['score_memo']:
+            self.score_memo = ScoreMemo(
+                os.path.join(self.config['state_dir'], self.config['score_memo_file']),
+                self.config['score_memo_max_entries'])
+        self.patent_store = PatentStore(os.path.join(self.config['state_dir'], self.config['patent_store']))
+        self.expiry_index = ExpiryIndex(os.path.join(self.config['state_dir'], self.config['expiry_index']))
+        self.gap_index = GapIndex(os.path.join(self.config['state_dir'], self.config['gap_index']))
+        self.cpc_index = CpcIndex(os.path.join(self.config['state_dir'], self.config['cpc_index']))
+        self.families = FamilyIndex(os.path.join(self.config['state_dir'], self.config['patent_families']))
+        self.citation_rank = CitationRank(
+            os.path.join(self.config['state_dir'], self.config['citation_rank']),
+            self.config['pagerank_damping'],
+            self.config['pagerank_tolerance'],
+            self.config['pagerank_max_iterations'])
+        self.corpus_refreshed = False
+        
+    def create_session(self):
+        """Create the pooled keep-alive session shared by every outbound call"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.config['pool_connections'],
+            pool_maxsize=self.config['pool_maxsize'],
+            pool_block=self.config['pool_block'])
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        session.headers.update(self.headers)
+        # gzip/deflate always, br when brotli is installed
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        session.headers['Connection'] = 'keep-alive' if self.config['keep_alive'] else 'close'
+        return session
+    
+    def connection_stats(self):
+        """Report connection reuse counters for every pooled host, across the requests and aiohttp pools"""
+        counters = ('connections_opened', 'requests_sent', 'connections_reused')
+        hosts = {}
+        for adapter in {id(a): a for a in self.session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                host = hosts.setdefault(f"{pool.scheme}://{pool.host}:{pool.port}", dict.fromkeys(counters, 0))
+                host['connections_opened'] += pool.num_connections
+                host['requests_sent'] += pool.num_requests
+                host['connections_reused'] += max(pool.num_requests - pool.num_connections, 0)
+        for name, counts in self.async_connections.items():
+            host = hosts.setdefault(name, dict.fromkeys(counters, 0))
+            for counter in counters:
+                host[counter] += counts[counter]
+        stats = {counter: sum(host[counter] for host in hosts.values()) for counter in counters}
+        stats['hosts'] = hosts
+        return stats
+    
+    def connection_trace(self):
+        """aiohttp trace hooks that count requests, new connections and pooled reuses per host"""
+        def counts(context):
+            return self.async_connections.setdefault(
+                context.host, {'connections_opened': 0, 'requests_sent': 0, 'connections_reused': 0})
+        
+        async def on_request_start(session, context, params):
+            # The per-request context carries the host to the connection hooks, which get no URL
+            context.host = f"{params.url.scheme}://{params.url.host}:{params.url.port}"
+            counts(context)['requests_sent'] += 1
+        
+        async def on_connection_create_end(session, context, params):
+            counts(context)['connections_opened'] += 1
         
+        async def on_connection_reuseconn(session, context, params):
+            counts(context)['connections_reused'] += 1
+        
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+    
+    def close(self):
+        """Close pooled connections and scoring workers"""
+        self.session.close()
+        self.scoring_pool.close()
+        self.patent_store.close()
+    
     def scrape_patent_opportunities(self):
         """Scrape for patent opportunities"""
         print("📜 SCRAPING PATENT OPPORTUNITIES...")
@@ -26,90 +2276,353 @@ class PatentScraper:
         opportunities = self.package_patent_opportunities(
             expired_patents, patent_gaps, patentable_innovations)
         
+        conn = self.connection_stats()
+        print(f"🔌 Connections: {conn['connections_opened']} opened, "
+              f"{conn['connections_reused']} reused for {conn['requests_sent']} requests")
+        limits = self.scheduler.stats
+        print(f"⏳ Rate limiting: {limits['requests']} calls, {limits['retries']} retries, "
+              f"{limits['throttled_seconds']:.1f}s throttled across calls")
+        if self.cache:
+            cache = self.cache.stats
+            print(f"🗄️ Response cache: {cache['hits']} hits (304s), {cache['stale']} stale, "
+                  f"{cache['misses']} misses, {cache['evictions']} evictions")
+        if self.score_memo:
+            memo = self.score_memo.stats
+            print(f"🧮 Score memo: {self.score_memo.hit_rate():.0%} hit rate "
+                  f"({memo['hits']} hits, {memo['misses']} misses, {memo['evictions']} evictions)")
+        pool = self.scoring_pool.stats
+        print(f"⚙️ Scoring: {pool['pooled_batches']} batches across {self.scoring_pool.workers} workers "
+              f"({pool['chunks']} chunks), {pool['inline_batches']} in-process")
+        
         return opportunities
     
+    def refresh_patent_corpus(self):
+        """Ingest new bulk files and rebuild the derived indexes when the corpus changed, once per run"""
+        if self.corpus_refreshed:
+            return
+        self.corpus_refreshed = True
+        stats = self.patent_store.ingest_directory(self.config['patent_bulk_dir'], self.config['ingest_batch_size'])
+        if stats['patents']:
+            print(f"📚 Ingested {stats['patents']} patents from {stats['files']} bulk files in "
+                  f"{stats['seconds']:.1f}s ({self.patent_store.throughput():.0f} patents/s, "
+                  f"{stats['errors']} unparseable records)")
+        if stats['fee_events']:
+            print(f"🧾 Maintenance fees: {stats['lapsed']} lapsed patents among {stats['fee_events']} events "
+                  f"in {stats['fee_seconds']:.1f}s")
+        if not len(self.patent_store):
+            return
+        
+        # A new fee file only changes lapse dates; every other index depends on the grants alone
+        if stats['files'] or stats['fee_files'] or not self.expiry_index.exists():
+            self.expiry_index.build(self.patent_store)
+        prior_art = self.scorer.prior_art
+        if stats['files'] or not prior_art.exists():
+            started = time.perf_counter()
+            prior_art.build(self.patent_store)
+            print(f"🔎 Built the prior-art index in {time.perf_counter() - started:.1f}s")
+            # Workers mapped the old index files
+            self.scoring_pool.close()
+        started = time.perf_counter()
+        # Incremental: only patents ingested since the last run are signed and bucketed
+        inserted = self.scorer.near_duplicates.insert(self.patent_store)
+        if inserted:
+            print(f"🧬 Added {inserted} patents to the near-duplicate index in {time.perf_counter() - started:.1f}s")
+            self.scoring_pool.close()
+        if stats['files'] or not self.gap_index.exists():
+            started = time.perf_counter()
+            self.gap_index.build(self.patent_store)
+            print(f"🕳️ Built the TF-IDF gap index in {time.perf_counter() - started:.1f}s")
+        if stats['files'] or not self.families.exists():
+            started = time.perf_counter()
+            patents, families = self.families.build(self.patent_store)
+            print(f"👪 Grouped {patents} patents into {families} families in {time.perf_counter() - started:.1f}s")
+        if stats['files'] or not self.cpc_index.exists():
+            started = time.perf_counter()
+            codes = self.cpc_index.build(self.patent_store)
+            print(f"🏷️ Indexed {codes} CPC groups in {time.perf_counter() - started:.1f}s")
+        nodes, edges = self.patent_store.citation_graph_size()
+        if edges and not self.citation_rank.current(nodes, edges, len(self.patent_store)):
+            started = time.perf_counter()
+            graph = self.citation_rank.build(self.patent_store)
+            print(f"🕸️ Ranked {nodes} patents over {edges} citations in {time.perf_counter() - started:.1f}s "
+                  f"({graph['iterations']} PageRank iterations)")
+    
     def find_expired_patents(self):
         """Find recently expired valuable patents"""
-        # Simulate patent database search
-        expired_patents = [
-            {
-                'patent_id': 'US7654321',
-                'title': 'Method for Automated Content Generation',
-                'expired_date': '2024-01-15',
-                'original_value': '$2M+',
-                'improvement_opportunities': [
-                    'Add AI/ML capabilities',
-                    'Mobile optimization',
-                    'Cloud-based implementation'
-                ],
-                'market_potential': '$10M+'
-            },
-            {
-                'patent_id': 'US8765432',
-                'title': 'System for Social Media Automation',
-                'expired_date': '2024-02-20',
-                'original_value': '$5M+',
-                'improvement_opportunities': [
-                    'Multi-platform integration',
-                    'Advanced analytics',
-                    'AI-powered content optimization'
-                ],
-                'market_potential': '$25M+'
-            }
-        ]
+        # Pick up any new weekly bulk files before querying the local corpus
+        self.refresh_patent_corpus()
+        if not len(self.patent_store):
+            print(f"⚠️ No patent corpus in {self.config['patent_bulk_dir']}, skipping expired patents")
+            return []
+        
+        today = datetime.now().date()
+        start = today - timedelta(days=self.config['expired_window_days'])
+        rowids, expiry_dates = self.expiry_index.between(start.isoformat(), today.isoformat())
+        if self.config['expired_patent_cpc'] and self.cpc_index.has_codes():
+            in_area = self.cpc_index.restrict(self.config['expired_patent_cpc'], rowids)
+            rowids, expiry_dates = rowids[in_area], expiry_dates[in_area]
+        ranked = self.citation_rank.exists()
+        influence = forward_citations = None
+        if ranked:
+            influence, forward_citations = self.citation_rank.lookup(rowids)
+            # Most influential first; the stable sort keeps latest expiry first among equals
+            order = np.argsort(-influence, kind='stable')
+            rowids, expiry_dates = rowids[order], expiry_dates[order]
+            influence, forward_citations = influence[order], forward_citations[order]
+        # One entry per family: its best-ranked expired member stands in for the rest
+        families = self.families.family_of(rowids)
+        _, first = np.unique(families, return_index=True)
+        keep = np.sort(first)[:self.config['max_expired_patents']]
+        rowids, expiry_dates, families = rowids[keep], expiry_dates[keep], families[keep]
+        if ranked:
+            influence, forward_citations = influence[keep], forward_citations[keep]
+        members = {family: self.families.members(family) for family in families.tolist()}
+        found = self.patent_store.fetch(np.concatenate([rowids] + list(members.values())))
+        expired_patents = []
+        for index, (rowid, expired_date, family) in enumerate(zip(rowids.tolist(), expiry_dates, families.tolist())):
+            if rowid not in found:
+                continue
+            patent = Patent(
+                patent_id=found[rowid][0],
+                title=found[rowid][1],
+                expired_date=str(expired_date),
+                filing_date=found[rowid][2],
+                grant_date=found[rowid][3],
+                expiry_reason='maintenance fee unpaid' if found[rowid][4] == str(expired_date) else 'end of term',
+                family_members=[found[member][0] for member in members[family].tolist() if member in found]
+            )
+            if ranked:
+                patent.influence = round(float(influence[index]), 3)
+                patent.forward_citations = int(forward_citations[index])
+                patent.original_value = (f"{patent.forward_citations} forward citations, "
+                                         f"{patent.influence:.1f}x average citation influence")
+                patent.market_potential = self.citation_rank.potential(patent.influence)
+            expired_patents.append(patent)
         
         return expired_patents
     
     def find_patent_gaps(self):
         """Find patent gaps in trending technologies"""
-        trending_techs = [
-            'AI agent orchestration',
-            'Serverless automation frameworks',
-            'Cross-platform development tools',
-            'Blockchain automation systems',
-            'Voice-controlled programming interfaces'
-        ]
+        trending_techs = list(self.config['technology_cpc'])
+        
+        self.refresh_patent_corpus()
+        measured = self.gap_index.exists()
+        expired = None
+        if self.cpc_index.has_codes() and self.expiry_index.exists():
+            today = datetime.now().date()
+            start = today - timedelta(days=self.config['expired_window_days'])
+            expired, _ = self.expiry_index.between(start.isoformat(), today.isoformat())
         
         gaps = []
         for tech in trending_techs:
-            gap = {
-                'technology': tech,
-                'current_patents': self.search_existing_patents(tech),
-                'gap_opportunities': self.identify_gaps(tech),
-                'patentability_score': self.calculate_patentability(tech),
-                'market_size': self.estimate_market_size(tech)
-            }
+            existing = self.search_existing_patents(tech)
+            recently_expired = None
+            prefixes = self.config['technology_cpc'][tech]
+            if expired is not None and prefixes:
+                recently_expired = int(np.count_nonzero(self.cpc_index.restrict(prefixes, expired)))
+            coverage, max_similarity = None, None
+            if measured:
+                coverage, max_similarity = self.gap_index.coverage(tech, self.config['gap_similarity_threshold'])
+                # A crowded area is not a gap
+                if coverage > self.config['gap_max_coverage']:
+                    continue
+            gap = PatentGap(
+                technology=tech,
+                current_patents=existing.count,
+                gap_opportunities=self.identify_gaps(tech),
+                patentability_score=self.calculate_patentability(tech),
+                market_size=self.estimate_market_size(tech),
+                related_patents=existing.patent_ids,
+                coverage=coverage,
+                max_similarity=max_similarity,
+                recently_expired=recently_expired
+            )
             gaps.append(gap)
         
         return gaps
     
     def analyze_github_innovations(self):
         """Analyze GitHub projects for patentable innovations"""
+        return asyncio.run(self.analyze_github_innovations_async())
+    
+    async def analyze_github_innovations_async(self):
+        """Analyze GitHub projects for patentable innovations, fanning queries out concurrently"""
         innovative_queries = [
             'novel algorithm created:>2024-01-01 stars:>20',
             'new framework created:>2024-01-01 stars:>15',
             'innovative system created:>2024-01-01 stars:>10'
         ]
         
-        innovations = []
-        for query in innovative_queries:
-            repos = self.search_repos(query)
-            for repo in repos[:5]:
-                innovation_score = self.assess_innovation_potential(repo)
-                if innovation_score > 70:
-                    innovations.append({
-                        'repo': repo,
-                        'innovation_score': innovation_score,
-                        'patent_potential': self.assess_patent_potential(repo),
-                        'commercial_value': f"${innovation_score * 10000}+"
-                    })
+        checkpoint = None
+        if self.config['incremental']:
+            checkpoint = RunCheckpoint(os.path.join(self.config['state_dir'], self.config['checkpoint_file']),
+                                       os.path.join(self.config['state_dir'], self.config['seen_file']))
+        
+        # Fire every query (and its pages) at once, merge in query order;
+        # the queries overlap heavily, so each repo is scored only once
+        seen = RepoIdSet()
+        rescored = set()
+        async with self.async_session():
+            results = await asyncio.gather(
+                *(self.collect_innovations_async(query, seen, checkpoint, rescored)
+                  for query in innovative_queries))
+            innovations = [innovation for innovations in results for innovation in innovations]
+            print(f"🔁 Fetched {len(seen)} unique repos, skipped {seen.duplicates} duplicates")
+            
+            if checkpoint:
+                # Repos outside the delta keep their previous result, but re-scored: the recent-creation
+                # bonus lapses with time alone, and the memo only holds a score until then
+                carried = checkpoint.carried_over(rescored)
+                scores = await self.memoized_innovation_scores_async([i.repo for i in carried])
+                innovations = checkpoint.merge(carried, scores, innovations, self.config['min_innovation_score'])
+            
+            top = TopK(self.config['top_k'])
+            for innovation in innovations:
+                top.push(innovation, innovation.innovation_score, innovation.repo.stargazers_count)
+            print(f"🏆 Kept the top {len(top)} of {top.pushed} innovations")
+            innovations = top.items()
+            
+            # Deeper signals for the shortlist only, ~50 repos per GraphQL round trip;
+            # carried-over innovations were enriched on an earlier run
+            unenriched = [i for i in innovations if i.metadata is None]
+            metadata = await self.fetch_repo_metadata_async([i.repo for i in unenriched])
+        
+        for innovation in unenriched:
+            innovation.metadata = metadata.get(innovation.repo.full_name)
         
+        # Prior-art matching against the patent corpus, batched across the shortlist
+        self.refresh_patent_corpus()
+        potentials = await self.scoring_pool.run_async(
+            'assess_patent_potential_batch', [(i.repo, i.metadata) for i in innovations])
+        for innovation, patent_potential in zip(innovations, potentials):
+            innovation.patent_potential = patent_potential
+        
+        if checkpoint:
+            checkpoint.innovations = innovations
+            checkpoint.save()
+            stats = checkpoint.stats
+            print(f"📈 Incremental run: {stats['scored']} repos scored, {stats['unchanged']} unchanged, "
+                  f"{stats['carried_over']} innovations carried over")
+        if self.score_memo:
+            self.score_memo.save()
         return innovations
     
+    async def collect_innovations_async(self, query, seen=None, checkpoint=None, rescored=None):
+        """Score repos for one query as their search pages arrive, skipping ids already seen"""
+        # With a checkpoint only the delta since the last run is fetched
+        search_query = checkpoint.delta_query(query) if checkpoint else query
+        shards = await self.shard_query_async(search_query) if self.config['shard_queries'] else [search_query]
+        max_items = self.config['max_repos_per_query'] or math.inf
+        seen = RepoIdSet() if seen is None else seen
+        rescored = set() if rescored is None else rescored
+        top = TopK(self.config['top_k_per_query'])
+        fetched = 0
+        
+        async def score_pending(pending):
+            # Score a batch in one vectorized pass, in the process pool once it is large enough
+            batch = pending[:]
+            pending.clear()
+            scores = await self.memoized_innovation_scores_async(batch)
+            for repo, innovation_score in zip(batch, scores):
+                rescored.add(repo.id)
+                if checkpoint:
+                    checkpoint.record(repo)
+                if innovation_score > self.config['min_innovation_score']:
+                    top.push((repo, innovation_score), innovation_score, repo.stargazers_count)
+        
+        async def consume(shard):
+            nonlocal fetched
+            pending = []
+            async for repo in self.iter_search_repos_async(shard):
+                if fetched >= max_items:
+                    break
+                fetched += 1
+                if checkpoint:
+                    checkpoint.observe(query, repo)
+                # Other queries and adjacent date windows return the same repos
+                if not seen.add(repo.id):
+                    continue
+                if checkpoint and checkpoint.unchanged(repo):
+                    continue
+                pending.append(repo)
+                if len(pending) >= self.config['scoring_batch_size']:
+                    await score_pending(pending)
+            await score_pending(pending)
+        
+        await asyncio.gather(*(consume(shard) for shard in shards))
+        
+        # Patent potential is assessed later, once the global shortlist has its READMEs
+        return [
+            Innovation(
+                repo=repo,
+                innovation_score=innovation_score,
+                patent_potential=None,
+                commercial_value=f"${innovation_score * 10000}+")
+            for repo, innovation_score in top.items()
+        ]
+    
+    async def shard_query_async(self, query):
+        """Split a query into created: date windows that each fit under the search result cap"""
+        match = CREATED_QUALIFIER.search(query)
+        start = datetime.strptime(self.config['shard_min_date'], '%Y-%m-%d').date()
+        end = datetime.now().date()
+        if match:
+            op, first, last = match.groups()
+            first = datetime.strptime(first, '%Y-%m-%d').date()
+            if last:
+                start, end = first, datetime.strptime(last, '%Y-%m-%d').date()
+            elif op == '>':
+                start = first + timedelta(days=1)
+            elif op == '>=':
+                start = first
+            elif op == '<':
+                end = first - timedelta(days=1)
+            elif op == '<=':
+                end = first
+            else:
+                start = end = first
+            query = CREATED_QUALIFIER.sub('', query)
+        base = ' '.join(query.split())
+        
+        windows = await self.bisect_window_async(base, start, end)
+        return [f"{base} created:{first:%Y-%m-%d}..{last:%Y-%m-%d}" for first, last in windows]
+    
+    async def bisect_window_async(self, base, start, end):
+        """Halve a created: window until each part has at most SEARCH_RESULT_CAP results"""
+        probe = await self.search_page_async(
+            f"{base} created:{start:%Y-%m-%d}..{end:%Y-%m-%d}", 1, per_page=1)
+        total = probe.get('total_count', 0)
+        if total == 0:
+            return []
+        if total <= SEARCH_RESULT_CAP:
+            return [(start, end)]
+        if start >= end:
+            print(f"⚠️ {total} results on {start} for '{base}', only {SEARCH_RESULT_CAP} reachable")
+            return [(start, end)]
+        
+        middle = start + (end - start) // 2
+        lower, upper = await asyncio.gather(
+            self.bisect_window_async(base, start, middle),
+            self.bisect_window_async(base, middle + timedelta(days=1), end))
+        return lower + upper
+    
     def search_existing_patents(self, technology):
         """Search for existing patents in technology area"""
-        # Simulate patent search
-        return f"12 existing patents found for {technology}"
+        prefixes = self.config['technology_cpc'].get(technology)
+        rowids = self.cpc_index.subtree(prefixes) if prefixes and self.cpc_index.has_codes() else None
+        # Full-text search covers corpora without CPC codes and areas none of their codes fall in
+        if rowids is None or not len(rowids):
+            return self.patent_store.search(technology, self.config['patent_search_limit'])
+        # The technology's CPC subtrees define the area; the most influential (or newest) grants represent it
+        if self.citation_rank.exists():
+            influence, _ = self.citation_rank.lookup(rowids)
+            top = rowids[np.argsort(-influence, kind='stable')]
+        else:
+            top = rowids[::-1]
+        top = top[:self.config['patent_search_limit']]
+        found = self.patent_store.fetch(top)
+        patent_ids = [found[rowid][0] for rowid in top.tolist() if rowid in found]
+        return PatentSearchResult(query=technology, count=len(rowids), patent_ids=patent_ids)
     
     def identify_gaps(self, technology):
         """Identify patent gaps in technology area"""
@@ -143,43 +2656,29 @@ class PatentScraper:
         }
         return market_sizes.get(technology, '$100M')
     
+    async def memoized_innovation_scores_async(self, repos):
+        """Score a batch of repos, reusing memoized scores and batch-scoring the rest in the pool"""
+        if not self.score_memo:
+            return await self.scoring_pool.run_async('score_batch', repos)
+        scores = [self.score_memo.lookup(repo) for repo in repos]
+        misses = [index for index, score in enumerate(scores) if score is None]
+        fresh = await self.scoring_pool.run_async('score_batch', [repos[index] for index in misses])
+        for index, score in zip(misses, fresh):
+            scores[index] = score
+            self.score_memo.store(repos[index], score)
+        return scores
+    
+    def score_batch(self, repos):
+        """Score a page of repos at once with NumPy; matches assess_innovation_potential exactly"""
+        return self.scorer.score_batch(repos)
+    
     def assess_innovation_potential(self, repo):
         """Assess innovation potential of GitHub repo"""
-        score = 0
-        
-        # Recent creation and activity
-        created_date = datetime.fromisoformat(repo['created_at'].replace('Z', '+00:00'))
-        days_old = (datetime.now(created_date.tzinfo) - created_date).days
-        if days_old < 90:
-            score += 20
-        
-        # Star momentum
-        score += min(repo['stargazers_count'], 30)
-        
-        # Innovation keywords
-        desc = repo.get('description', '').lower()
-        innovation_keywords = ['novel', 'new', 'innovative', 'breakthrough', 'unique', 'original']
-        for keyword in innovation_keywords:
-            if keyword in desc:
-                score += 10
-        
-        # Technology relevance
-        tech_keywords = ['ai', 'machine learning', 'blockchain', 'automation', 'algorithm']
-        for keyword in tech_keywords:
-            if keyword in desc:
-                score += 8
-        
-        return min(score, 100)
+        return self.scorer.assess_innovation_potential(repo)
     
-    def assess_patent_potential(self, repo):
+    def assess_patent_potential(self, repo, metadata=None):
         """Assess patent potential of repository"""
-        factors = {
-            'novelty': 'High - unique approach',
-            'non_obviousness': 'Medium - some existing solutions',
-            'utility': 'High - practical applications',
-            'enablement': 'High - well documented'
-        }
-        return factors
+        return self.scorer.assess_patent_potential(repo, metadata)
     
     def package_patent_opportunities(self, expired_patents, gaps, innovations):
         """Package patent opportunities for sale"""
@@ -210,15 +2709,241 @@ class PatentScraper:
         
         return package
     
-    def search_repos(self, query):
+    def search_repos(self, query, max_items=None):
         """Search GitHub repositories"""
-        url = "https://api.github.com/search/repositories"
-        response = requests.get(url, params={'q': query}, headers=self.headers)
-        if response.status_code == 200:
-            return response.json().get('items', [])
-        return []
+        return list(self.iter_search_repos(query, max_items))
+    
+    def iter_search_repos(self, query, max_items=None):
+        """Lazily yield GitHub search results page by page, following Link rel=next"""
+        max_items = max_items or self.config['max_repos_per_query'] or math.inf
+        url = f"{self.config['api_url']}/search/repositories"
+        params = {'q': query, 'per_page': self.config['per_page']}
+        yielded = 0
+        while url:
+            data, headers = self.github_request('GET', url, params=params, cache=self.repeatable_query(query))
+            for item in data.get('items', []):
+                yield Repo.from_json(item)
+                yielded += 1
+                if yielded >= max_items:
+                    return
+            # The next link already carries the query string
+            url, params = self.next_page_url(headers), None
+    
+    @staticmethod
+    def next_page_url(headers):
+        """Extract the rel=next URL from a GitHub Link header"""
+        for link in parse_header_links(headers.get('Link', '')):
+            if link.get('rel') == 'next':
+                return link['url']
+        return None
+    
+    def github_request(self, method, url, params=None, cache=True, **kwargs):
+        """Send a GitHub API request through the response cache and rate-limit scheduler"""
+        resource = self.scheduler.resource_for(url)
+        key = entry = None
+        if self.cache and cache and method == 'GET':
+            key = self.cache.key_for(url, params)
+            entry = self.cache.lookup(key)
+        headers = self.cache.conditional_headers(entry) if self.cache else {}
+        
+        for attempt in range(self.scheduler.max_retries + 1):
+            self.scheduler.acquire(resource)
+            try:
+                response = self.session.request(
+                    method, url, params=params, headers=headers,
+                    timeout=self.config['request_timeout'], **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                # Resets and timeouts are transient; surface them only once retries run out
+                if attempt == self.scheduler.max_retries:
+                    raise
+                time.sleep(self.scheduler.retry_delay(attempt, {}))
+                continue
+            self.scheduler.update(resource, response.headers)
+            if (attempt == self.scheduler.max_retries or not self.scheduler.is_retryable(
+                    response.status_code, response.headers, response.text)):
+                break
+            time.sleep(self.scheduler.retry_delay(attempt, response.headers))
+        
+        if response.status_code == 304 and entry:
+            self.scheduler.refund(resource)
+            return self.cache.revalidated(key, entry)
+        
+        # Surface exhausted retries instead of silently returning nothing
+        response.raise_for_status()
+        data = response.json()
+        if key:
+            self.cache.store(key, data, response.headers, stale=entry is not None)
+        return data, response.headers
+    
+    def fetch_repo_metadata(self, repos):
+        """Fetch topics, README, release count and recent commits for many repos via GraphQL"""
+        metadata = {}
+        for chunk in self.metadata_chunks(repos):
+            data, _ = self.github_request(
+                'POST', f"{self.config['api_url']}/graphql", json={'query': self.metadata_query(chunk)})
+            metadata.update(self.parse_metadata(chunk, data))
+        return metadata
+    
+    async def fetch_repo_metadata_async(self, repos):
+        """Fetch repo metadata via GraphQL, sending every chunk concurrently"""
+        chunks = list(self.metadata_chunks(repos))
+        responses = await asyncio.gather(
+            *(self.github_request_async(
+                'POST', f"{self.config['api_url']}/graphql", json={'query': self.metadata_query(chunk)})
+              for chunk in chunks))
+        metadata = {}
+        for chunk, (data, _) in zip(chunks, responses):
+            metadata.update(self.parse_metadata(chunk, data))
+        return metadata
+    
+    def metadata_chunks(self, repos):
+        """Split repos into GraphQL queries whose estimated cost stays under the configured limit"""
+        # GitHub charges roughly one point per 100 connections requested; the chunks all go out at once, so
+        # this is an estimate, and each response's X-RateLimit-* headers keep the graphql bucket honest
+        by_cost = self.config['graphql_max_cost'] * 100 // REPO_METADATA_CONNECTIONS
+        size = max(1, min(self.config['graphql_batch_size'], by_cost))
+        unique = list({repo.full_name: repo for repo in repos}.values())
+        for start in range(0, len(unique), size):
+            yield unique[start:start + size]
+    
+    def metadata_query(self, repos):
+        """Build one aliased GraphQL query covering every repo in the chunk"""
+        since = (datetime.now(timezone.utc) - timedelta(days=self.config['activity_window_days'])).strftime(
+            '%Y-%m-%dT%H:%M:%SZ')
+        fields = REPO_METADATA_FIELDS % json.dumps(since)
+        blocks = []
+        for index, repo in enumerate(repos):
+            owner, name = repo.full_name.split('/', 1)
+            blocks.append(f"r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{{fields}}}")
+        return "query {\n%s\n}" % '\n'.join(blocks)
+    
+    @staticmethod
+    def parse_metadata(repos, data):
+        """Map aliased GraphQL results back to repo full names"""
+        results = data.get('data') or {}
+        metadata = {}
+        for index, repo in enumerate(repos):
+            node = results.get(f"r{index}")
+            # Deleted/renamed repos come back null with an error entry
+            if not node:
+                continue
+            history = ((node.get('defaultBranchRef') or {}).get('target') or {}).get('history') or {}
+            metadata[repo.full_name] = {
+                'topics': [t['topic']['name'] for t in node['repositoryTopics']['nodes']],
+                'release_count': node['releases']['totalCount'],
+                'readme': (node.get('readme') or {}).get('text') or '',
+                'recent_commits': history.get('totalCount', 0),
+                'stars': node['stargazerCount']
+            }
+        return metadata
+    
+    @contextlib.asynccontextmanager
+    async def async_session(self):
+        """Open the aiohttp session and concurrency limit for one async run"""
+        # Same pool shape as the requests adapter: pool_maxsize per host, for up to pool_connections hosts
+        connector = aiohttp.TCPConnector(
+            limit=self.config['pool_connections'] * self.config['pool_maxsize'],
+            limit_per_host=self.config['pool_maxsize'],
+            force_close=not self.config['keep_alive'])
+        timeout = aiohttp.ClientTimeout(total=self.config['request_timeout'])
+        async with aiohttp.ClientSession(
+                headers=self.headers, connector=connector, timeout=timeout,
+                trace_configs=[self.connection_trace()]) as session:
+            self.async_client = session
+            self.semaphore = asyncio.Semaphore(self.config['max_concurrency'])
+            try:
+                yield session
+            finally:
+                self.async_client = None
+                self.semaphore = None
+    
+    async def search_repos_async(self, query, max_items=None):
+        """Search GitHub repositories, fetching all pages concurrently"""
+        return [repo async for repo in self.iter_search_repos_async(query, max_items)]
+    
+    async def iter_search_repos_async(self, query, max_items=None):
+        """Yield GitHub search results as each page arrives, fetching later pages concurrently"""
+        max_items = max_items or self.config['max_repos_per_query'] or math.inf
+        per_page = self.config['per_page']
+        
+        # Page 1 tells us how many pages exist; the rest go out at once
+        first = await self.search_page_async(query, 1)
+        total = min(first.get('total_count', 0), SEARCH_RESULT_CAP, max_items)
+        pending = [asyncio.ensure_future(self.search_page_async(query, page))
+                   for page in range(2, math.ceil(total / per_page) + 1)]
+        
+        yielded = 0
+        try:
+            pages = [first]
+            while pages:
+                for item in pages.pop().get('items', []):
+                    yield Repo.from_json(item)
+                    yielded += 1
+                    if yielded >= max_items:
+                        return
+                if pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    pages.extend(task.result() for task in done)
+                    pending = list(pending)
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def search_page_async(self, query, page, per_page=None):
+        """Fetch one page of GitHub repository search results"""
+        url = f"{self.config['api_url']}/search/repositories"
+        params = {'q': query, 'page': page, 'per_page': per_page or self.config['per_page']}
+        data, _ = await self.github_request_async('GET', url, params=params, cache=self.repeatable_query(query))
+        return data
+    
+    @staticmethod
+    def repeatable_query(query):
+        """Whether a search URL can recur on a later day, i.e. every date the query names is already past"""
+        # Shards and count probes ending today, and deltas from today's mark, name a date that rolls over
+        # by the next run, so caching them would only evict entries that can still revalidate
+        today = datetime.now().strftime('%Y-%m-%d')
+        return all(day < today for day in QUERY_DATE.findall(query))
+    
+    async def github_request_async(self, method, url, params=None, cache=True, **kwargs):
+        """Send a GitHub API request from the event loop through the cache and scheduler"""
+        resource = self.scheduler.resource_for(url)
+        key = entry = None
+        if self.cache and cache and method == 'GET':
+            key = self.cache.key_for(url, params)
+            entry = self.cache.lookup(key)
+        headers = self.cache.conditional_headers(entry) if self.cache else {}
+        
+        for attempt in range(self.scheduler.max_retries + 1):
+            await self.scheduler.acquire_async(resource)
+            try:
+                async with self.semaphore:
+                    async with self.async_client.request(
+                            method, url, params=params, headers=headers, **kwargs) as response:
+                        self.scheduler.update(resource, response.headers)
+                        text = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # One reset page must not fail the whole gather it belongs to
+                if attempt == self.scheduler.max_retries:
+                    raise
+                await asyncio.sleep(self.scheduler.retry_delay(attempt, {}))
+                continue
+            if (attempt == self.scheduler.max_retries or not self.scheduler.is_retryable(
+                    response.status, response.headers, text)):
+                break
+            await asyncio.sleep(self.scheduler.retry_delay(attempt, response.headers))
+        
+        if response.status == 304 and entry:
+            self.scheduler.refund(resource)
+            return self.cache.revalidated(key, entry)
+        
+        response.raise_for_status()
+        data = json.loads(text)
+        if key:
+            self.cache.store(key, data, response.headers, stale=entry is not None)
+        return data, response.headers
 
 if __name__ == "__main__":
     import os
     scraper = PatentScraper(os.getenv('GITHUB_TOKEN'))
     scraper.scrape_patent_opportunities()
+    scraper.close()
@@ -0,0 +1,61 @@
+"""Patent term rules of ExpirationCalculator, and date validation at ingest"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agent import BulkGrantParser, ExpirationCalculator
+
+
+def expiry(filing, grant, kind='B2', patent_id='US7000000', extension=None, disclaimer=0, disclaimed=None,
+           years=None, lapsed=None):
+    row = (1, patent_id, kind, filing, grant, extension, disclaimer, disclaimed, years, lapsed)
+    return str(ExpirationCalculator.expiry_dates([row])[0])
+
+
+def test_pre_uraa_filings_get_the_longer_of_17_from_grant_and_20_from_filing():
+    assert expiry('1990-01-10', '1993-03-02') == '2010-03-02'
+    assert expiry('1994-01-03', '1994-06-01') == '2014-01-03'
+    # Filed on the URAA date: 20 years from filing only
+    assert expiry('1995-06-08', '1995-07-04') == '2015-06-08'
+
+
+def test_term_adjustment_is_dropped_under_a_terminal_disclaimer():
+    assert expiry('2005-03-15', '2008-01-01', extension=100) == '2025-06-23'
+    assert expiry('2005-03-15', '2008-01-01', extension=100, disclaimer=1) == '2025-03-15'
+
+
+def test_design_terms():
+    assert expiry('2014-01-10', '2015-02-03', kind='S1', patent_id='USD700000') == '2029-02-03'
+    assert expiry('2016-01-04', '2017-05-02', kind='S1', patent_id='USD800000') == '2032-05-02'
+    # Recognized as design by the number alone, and a stated length wins
+    assert expiry('2016-01-04', '2017-05-02', kind=None, patent_id='USD800001', years='14') == '2031-05-02'
+
+
+def test_dated_disclaimer_and_lapse_cut_the_term_short():
+    assert expiry('2005-03-15', '2008-01-01', disclaimed='2020-01-01') == '2020-01-01'
+    assert expiry('2005-03-15', '2008-01-01', lapsed='2012-08-15') == '2012-08-15'
+    assert expiry('2005-03-15', '2008-01-01', disclaimed='2020-01-01', lapsed='2012-08-15') == '2012-08-15'
+    # A cutoff after the natural expiry changes nothing
+    assert expiry('2005-03-15', '2008-01-01', lapsed='2030-01-01') == '2025-03-15'
+
+
+def test_february_29():
+    assert expiry('2004-02-29', '2007-01-02') == '2024-02-29'
+    assert expiry('1999-05-03', '2000-02-29', kind='S', patent_id='USD420000') == '2014-03-01'
+
+
+def test_invalid_dates_become_unknown():
+    assert BulkGrantParser.iso_date('00000000') is None
+    assert BulkGrantParser.iso_date('20050230') is None
+    assert BulkGrantParser.iso_date('2005-02-30') is None
+    assert BulkGrantParser.iso_date('') is None
+    assert BulkGrantParser.iso_date('20050301') == '2005-03-01'
+    assert BulkGrantParser.iso_date('2005-03-01') == '2005-03-01'
+    # Rows stored before validation are read back as NaT instead of failing the whole chunk
+    rows = [(1, 'US7000001', 'B2', '0000-00-00', '2008-01-01', None, 0, None, None, None),
+            (2, 'US7000002', 'B2', '2005-02-30', '2008-01-01', None, 0, None, None, None),
+            (3, 'US7000003', 'B2', '2005-03-15', '2008-01-01', None, 0, '0000-00-00', None, None)]
+    assert [str(day) for day in ExpirationCalculator.expiry_dates(rows)] == ['NaT', 'NaT', '2025-03-15']
+    assert np.isnat(ExpirationCalculator.dates(['2005-02-30', None])).all()
@@ -0,0 +1,61 @@
+"""Recall of the LSH-shortlisted prior-art search against full BM25 scoring"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agent import NearDuplicateIndex, PatentStore, PriorArtIndex
+
+PATENTS = 5000
+QUERIES = 200
+
+
+def zipf_words(rng, count, prefix='term', vocabulary=30000):
+    ranks = np.minimum(rng.zipf(1.1, count), vocabulary)
+    return [f"{prefix}{rank}" for rank in ranks]
+
+
+def build_corpus(directory):
+    rng = np.random.default_rng(7)
+    store = PatentStore(os.path.join(directory, 'patents.sqlite'))
+    rows = [(f"US{8000000 + number}", ' '.join(zipf_words(rng, 8)), ' '.join(zipf_words(rng, 120)),
+             ' '.join(zipf_words(rng, 200))) for number in range(PATENTS)]
+    store.upsert(('patent_id', 'title', 'abstract', 'claims'), rows)
+    store.db.commit()
+    # A top-up budget of ~0.1% of the corpus's postings, so the test exercises the shortlist, not a full scan
+    prior_art = PriorArtIndex(os.path.join(directory, 'prior-art-index'), topup_postings=2000)
+    prior_art.build(store)
+    near_duplicates = NearDuplicateIndex(os.path.join(directory, 'near-duplicate-index'))
+    near_duplicates.insert(store)
+    return rng, store, rows, prior_art, near_duplicates
+
+
+def repo_queries(rng, rows):
+    """20 words of a known patent buried in README-sized noise, like a repo's description + README"""
+    queries, expected = [], []
+    for index in rng.choice(len(rows), QUERIES, replace=False):
+        patent_id, _, abstract, claims = rows[index]
+        words = (abstract + ' ' + claims).split()
+        borrowed = [words[i] for i in rng.choice(len(words), 20, replace=False)]
+        # README noise: mostly its own vocabulary (install, usage...), some words patents use too
+        noise = zipf_words(rng, 680, prefix='readme') + zipf_words(rng, 20)
+        queries.append(' '.join(borrowed + noise))
+        expected.append(patent_id)
+    return queries, expected
+
+
+def recall(results, expected):
+    return sum(patent_id in [match for match, _ in result['matches']]
+               for result, patent_id in zip(results, expected)) / len(expected)
+
+
+def test_shortlist_recall_matches_full_bm25(tmp_path):
+    rng, store, rows, prior_art, near_duplicates = build_corpus(str(tmp_path))
+    queries, expected = repo_queries(rng, rows)
+    full = recall(prior_art.top_matches(queries, 5), expected)
+    shortlisted = recall(prior_art.top_matches(queries, 5, near_duplicates.candidates(queries, 500)), expected)
+    store.close()
+    print(f"top-5 recall: full BM25 {full:.2f}, shortlisted {shortlisted:.2f}")
+    assert full >= 0.95
+    assert shortlisted >= full - 0.02
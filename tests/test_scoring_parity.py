@@ -0,0 +1,71 @@
+"""Parity of the vectorized score_batch against the scalar assess_innovation_potential"""
+import dataclasses
+import os
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import agent
+from agent import RECENT_REPO_DAYS, InnovationScorer, Repo
+
+REPOS = 5000
+NOW = 1790000000
+
+# Keywords, plus words that contain them without matching them as whole words
+WORDS = ['novel', 'new', 'innovative', 'breakthrough', 'unique', 'original', 'ai', 'machine learning',
+         'blockchain', 'automation', 'algorithm', 'maintain', 'news', 'renewal', 'paint', 'novelty',
+         'originally', 'uniquely', 'algorithms', 'machine', 'learning', 'machinelearning', 'said', 'tool',
+         'AI', 'New', 'BLOCKCHAIN', 'Machine Learning', 'ai_tools', 'ai2', 'AI-powered', '(new)', 'new.',
+         '"breakthrough"', 'e-novel', 'api', 'chain', 'automation/ai']
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.fromtimestamp(NOW, tz)
+
+
+def created_at(age_seconds):
+    return datetime.fromtimestamp(NOW - age_seconds, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def random_repos(rng):
+    cutoff = RECENT_REPO_DAYS * 86400
+    # Half the ages sit within a minute of the recency cutoff, including the exact boundary second
+    ages = np.where(rng.random(REPOS) < 0.5, cutoff + rng.integers(-60, 61, REPOS),
+                    rng.integers(0, 4 * cutoff, REPOS))
+    ages[:3] = [cutoff - 1, cutoff, cutoff + 1]
+    repos = []
+    for number, age in enumerate(ages):
+        separators = rng.choice([' ', ', ', ' - ', '; ', '\n'], 6)
+        words = rng.choice(WORDS, rng.integers(0, 7))
+        description = ''.join(f"{word}{separator}" for word, separator in zip(words, separators)).strip()
+        repos.append(Repo(number, f"owner/repo{number}", f"https://github.com/owner/repo{number}", description,
+                          created_at(int(age)), created_at(0), created_at(0), int(rng.integers(0, 60))))
+    return repos
+
+
+def test_score_batch_matches_scalar(monkeypatch):
+    monkeypatch.setattr(agent.time, 'time', lambda: float(NOW))
+    monkeypatch.setattr(agent, 'datetime', FrozenDatetime)
+    scorer = InnovationScorer()
+    repos = random_repos(np.random.default_rng(11))
+    batch = scorer.score_batch(repos)
+    scalar = [scorer.assess_innovation_potential(repo) for repo in repos]
+    mismatches = [(repo.created_at, repo.description, b, s) for repo, b, s in zip(repos, batch, scalar) if b != s]
+    print(f"\n   {len(repos)} repos, {len(mismatches)} mismatches")
+    assert not mismatches, mismatches[:5]
+    # One second inside the cutoff still earns the recency bonus; the cutoff itself does not
+    boundary = [dataclasses.replace(repo, description='', stargazers_count=0) for repo in repos[:3]]
+    assert scorer.score_batch(boundary) == [20, 0, 0]
+
+
+def test_keywords_match_whole_words_only():
+    scorer = InnovationScorer()
+    keywords = scorer.keyword_matcher.keywords
+    assert scorer.keyword_matcher.find('maintain renewal news') == set()
+    assert scorer.keyword_matcher.find('machine-learning') == set()
+    assert scorer.keyword_matcher.find('ai-powered (new) machine learning.') == {
+        keywords.index('ai'), keywords.index('new'), keywords.index('machine learning')}